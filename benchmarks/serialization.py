@@ -0,0 +1,79 @@
+"""Compare task execution serialization: restx marshal + jsonify vs ModelEncoder.
+
+Usage (from the repository root):
+
+    python -m benchmarks.serialization --executions 100000
+
+Objects are built in memory (no database), so only serialization is timed.
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from flask import jsonify
+from flask_restx import marshal
+
+from src.robot_management import create_app
+from src.robot_management.api.encoders import task_execution_encoder
+from src.robot_management.api.parsers import task_execution_model
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.util import serialization
+
+EPOCH = datetime(2021, 1, 1)
+
+
+def build(executions):
+    robots = [Robot(name=f"robot-{i}", type="amr") for i in range(50)]
+    tasks = [Task(name=f"task-{i}", type="transport") for i in range(20)]
+    return [
+        TaskExecution(
+            id=i,
+            robot=robots[i % len(robots)],
+            task=tasks[i % len(tasks)],
+            start=EPOCH + timedelta(seconds=i),
+            end=EPOCH + timedelta(seconds=i + 90),
+            success=i % 3 != 0,
+        )
+        for i in range(executions)
+    ]
+
+
+def measure(label, func):
+    started = time.perf_counter()
+    body = func()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.3f}s  peak {peak / 2**20:8.1f} MiB  {len(body)} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--executions", type=int, default=100000)
+    args = parser.parse_args()
+    app = create_app("testing")
+    with app.test_request_context():
+        executions = build(args.executions)
+        measure(
+            "marshal + jsonify",
+            lambda: jsonify(
+                task_executions=marshal(executions, task_execution_model)
+            ).get_data(),
+        )
+        for backend in ("json", "orjson"):
+            name = serialization.use_backend(backend)
+            measure(
+                f"ModelEncoder + {name}",
+                lambda: serialization.dumps(
+                    dict(task_executions=task_execution_encoder.many(executions))
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
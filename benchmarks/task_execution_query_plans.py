@@ -0,0 +1,144 @@
+"""Compare /task-executions query plans and timings with and without indexes.
+
+Usage (from the repository root):
+
+    TEST_DATABASE_URL=postgresql://... python -m benchmarks.task_execution_query_plans
+
+Without TEST_DATABASE_URL an in-memory SQLite database is used. The tables are
+dropped and recreated, so never point this at a database holding real data.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.robot_management import create_app, db
+from src.robot_management.api.task_executions.filters import filter_task_executions
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+
+ROBOT_TYPES = ["amr", "forklift", "tugger", "pallet-jack"]
+TASK_TYPES = ["transport", "charge", "inspect"]
+EPOCH = datetime(2021, 1, 1)
+
+FILTERS = {
+    "first page": {},
+    "robot_name": dict(robot_name="robot-7"),
+    "robot_type": dict(robot_type="forklift"),
+    "task_name + status": dict(task_name="task-3", status="Failed"),
+    "start/end range": dict(
+        start=EPOCH + timedelta(days=20), end=EPOCH + timedelta(days=21)
+    ),
+}
+
+
+def seed(executions, robots=50, tasks=20):
+    db.drop_all()
+    db.create_all()
+    db.session.bulk_insert_mappings(
+        Robot,
+        [
+            dict(id=i, name=f"robot-{i}", type=ROBOT_TYPES[i % len(ROBOT_TYPES)])
+            for i in range(1, robots + 1)
+        ],
+    )
+    db.session.bulk_insert_mappings(
+        Task,
+        [
+            dict(id=i, name=f"task-{i}", type=TASK_TYPES[i % len(TASK_TYPES)])
+            for i in range(1, tasks + 1)
+        ],
+    )
+    rng = random.Random(42)
+    batch = []
+    for _ in range(executions):
+        start = EPOCH + timedelta(seconds=rng.randrange(60 * 86400))
+        batch.append(
+            dict(
+                robot_id=rng.randint(1, robots),
+                task_id=rng.randint(1, tasks),
+                start=start,
+                end=start + timedelta(seconds=rng.randrange(30, 3600)),
+                success=rng.random() < 0.9,
+            )
+        )
+        if len(batch) == 10000:
+            db.session.bulk_insert_mappings(TaskExecution, batch)
+            batch = []
+    db.session.bulk_insert_mappings(TaskExecution, batch)
+    db.session.commit()
+
+
+def set_indexes(enabled):
+    indexes = list(TaskExecution.__table__.indexes)
+    indexes += list(Robot.__table__.indexes) + list(Task.__table__.indexes)
+    with db.engine.begin() as connection:
+        for index in indexes:
+            if enabled:
+                index.create(connection)
+            else:
+                index.drop(connection)
+    if db.engine.dialect.name == "postgresql":
+        with db.engine.connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT").execute(
+                "ANALYZE"
+            )
+
+
+def explain(query):
+    compiled = query.statement.compile(dialect=db.engine.dialect)
+    if compiled.positional:
+        params = [compiled.params[name] for name in compiled.positiontup]
+    else:
+        params = compiled.params
+    if db.engine.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF) "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+    connection = db.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(prefix + str(compiled), params)
+        return [" ".join(str(col) for col in row) for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+def run(limit, repeat):
+    for label, filter_dict in FILTERS.items():
+        query = (
+            filter_task_executions(filter_dict)
+            .order_by(TaskExecution.start, TaskExecution.id)
+            .limit(limit)
+        )
+        started = time.perf_counter()
+        for _ in range(repeat):
+            query.all()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+        print(f"  {label}: {elapsed_ms:.2f} ms")
+        for line in explain(query):
+            print(f"      {line}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--executions", type=int, default=200000)
+    arg_parser.add_argument("--limit", type=int, default=100)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        print(f"Seeding {args.executions} task executions...")
+        seed(args.executions)
+        print("Without indexes:")
+        set_indexes(False)
+        run(args.limit, args.repeat)
+        print("With indexes:")
+        set_indexes(True)
+        run(args.limit, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""add task execution indexes
+
+Revision ID: 5b3e9c1d7a42
+Revises: 804abe95b1b8
+Create Date: 2026-10-18 10:12:31.482913
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5b3e9c1d7a42'
+down_revision = '804abe95b1b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Every composite index ends in (start, id) so that filtered lists can be
+    # served in keyset order straight from the index. token_blacklist.token and
+    # site_user.public_id are already covered by their unique constraints.
+    op.create_index('ix_robot_type', 'robot', ['type'], unique=False)
+    op.create_index('ix_task_type', 'task', ['type'], unique=False)
+    op.create_index('ix_task_execution_start_id', 'task_execution', ['start', 'id'], unique=False)
+    op.create_index('ix_task_execution_robot_id_start_id', 'task_execution', ['robot_id', 'start', 'id'], unique=False)
+    op.create_index('ix_task_execution_task_id_start_id', 'task_execution', ['task_id', 'start', 'id'], unique=False)
+    op.create_index('ix_task_execution_success_start_id', 'task_execution', ['success', 'start', 'id'], unique=False)
+    op.create_index('ix_task_execution_end', 'task_execution', ['end'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_execution_end', table_name='task_execution')
+    op.drop_index('ix_task_execution_success_start_id', table_name='task_execution')
+    op.drop_index('ix_task_execution_task_id_start_id', table_name='task_execution')
+    op.drop_index('ix_task_execution_robot_id_start_id', table_name='task_execution')
+    op.drop_index('ix_task_execution_start_id', table_name='task_execution')
+    op.drop_index('ix_task_type', table_name='task')
+    op.drop_index('ix_robot_type', table_name='robot')
@@ -0,0 +1,47 @@
+"""store revoked token jti instead of the full token
+
+Revision ID: c71d0e5f2a93
+Revises: 9f2c4e6a8b10
+Create Date: 2026-10-18 12:20:07.118450
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71d0e5f2a93'
+down_revision = '9f2c4e6a8b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('token_blacklist', sa.Column('jti', sa.String(length=64), nullable=True))
+    # Tokens issued before the jti claim existed are keyed by their digest,
+    # matching User.decode_access_token.
+    connection = op.get_bind()
+    rows = connection.execute(sa.text('SELECT id, token FROM token_blacklist')).fetchall()
+    for id, token in rows:
+        jti = hashlib.blake2b(token.encode('ascii'), digest_size=16).hexdigest()
+        connection.execute(
+            sa.text('UPDATE token_blacklist SET jti = :jti WHERE id = :id'),
+            jti=jti,
+            id=id,
+        )
+    op.alter_column('token_blacklist', 'jti', nullable=False)
+    op.create_unique_constraint('token_blacklist_jti_key', 'token_blacklist', ['jti'])
+    op.drop_constraint('token_blacklist_token_key', 'token_blacklist', type_='unique')
+    op.drop_column('token_blacklist', 'token')
+
+
+def downgrade():
+    # Full tokens cannot be recovered from their jti; revoked tokens will be
+    # accepted again until they expire.
+    op.execute('DELETE FROM token_blacklist')
+    op.add_column('token_blacklist', sa.Column('token', sa.String(length=500), nullable=False))
+    op.create_unique_constraint('token_blacklist_token_key', 'token_blacklist', ['token'])
+    op.drop_constraint('token_blacklist_jti_key', 'token_blacklist', type_='unique')
+    op.drop_column('token_blacklist', 'jti')
@@ -0,0 +1,101 @@
+"""range-partition token_blacklist by expires_at on postgresql
+
+Revision ID: e4a81b6c3d57
+Revises: c71d0e5f2a93
+Create Date: 2026-10-18 14:02:51.630918
+
+"""
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a81b6c3d57'
+down_revision = 'c71d0e5f2a93'
+branch_labels = None
+depends_on = None
+
+DAYS_AHEAD = 7
+
+
+def upgrade():
+    # Other backends keep the plain table; `flask purge-tokens` deletes
+    # expired rows in batches there.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.rename_table('token_blacklist', 'token_blacklist_old')
+    # The constraint indexes keep their names through the rename; free them
+    # for the partitioned table.
+    op.execute(
+        'ALTER TABLE token_blacklist_old RENAME CONSTRAINT '
+        'token_blacklist_pkey TO token_blacklist_old_pkey'
+    )
+    op.execute(
+        'ALTER TABLE token_blacklist_old RENAME CONSTRAINT '
+        'token_blacklist_jti_key TO token_blacklist_old_jti_key'
+    )
+    op.execute(
+        'CREATE TABLE token_blacklist ('
+        ' id INTEGER NOT NULL,'
+        ' jti VARCHAR(64) NOT NULL,'
+        ' blacklisted_on TIMESTAMP WITHOUT TIME ZONE,'
+        ' expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,'
+        ' CONSTRAINT token_blacklist_pkey PRIMARY KEY (id, expires_at),'
+        ' CONSTRAINT token_blacklist_jti_key UNIQUE (jti, expires_at)'
+        ') PARTITION BY RANGE (expires_at)'
+    )
+    op.execute('ALTER SEQUENCE token_blacklist_id_seq OWNED BY token_blacklist.id')
+    op.execute(
+        "ALTER TABLE token_blacklist ALTER COLUMN id "
+        "SET DEFAULT nextval('token_blacklist_id_seq')"
+    )
+    op.execute('CREATE TABLE token_blacklist_default PARTITION OF token_blacklist DEFAULT')
+    today = datetime.now(timezone.utc).date()
+    for offset in range(DAYS_AHEAD + 1):
+        day = today + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE token_blacklist_p{day.strftime('%Y%m%d')} "
+            f"PARTITION OF token_blacklist "
+            f"FOR VALUES FROM ('{day.isoformat()}') "
+            f"TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+    op.execute(
+        'INSERT INTO token_blacklist (id, jti, blacklisted_on, expires_at) '
+        'SELECT id, jti, blacklisted_on, expires_at FROM token_blacklist_old '
+        "WHERE expires_at > (now() AT TIME ZONE 'utc')"
+    )
+    op.drop_table('token_blacklist_old')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.rename_table('token_blacklist', 'token_blacklist_partitioned')
+    op.create_table('token_blacklist',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(length=64), nullable=False),
+    sa.Column('blacklisted_on', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name='token_blacklist_unpartitioned_pkey'),
+    sa.UniqueConstraint('jti', name='token_blacklist_unpartitioned_jti_key')
+    )
+    op.execute(
+        'INSERT INTO token_blacklist (id, jti, blacklisted_on, expires_at) '
+        'SELECT id, jti, blacklisted_on, expires_at FROM token_blacklist_partitioned'
+    )
+    op.execute('ALTER SEQUENCE token_blacklist_id_seq OWNED BY token_blacklist.id')
+    op.execute(
+        "ALTER TABLE token_blacklist ALTER COLUMN id "
+        "SET DEFAULT nextval('token_blacklist_id_seq')"
+    )
+    op.drop_table('token_blacklist_partitioned')
+    op.execute(
+        'ALTER TABLE token_blacklist RENAME CONSTRAINT '
+        'token_blacklist_unpartitioned_pkey TO token_blacklist_pkey'
+    )
+    op.execute(
+        'ALTER TABLE token_blacklist RENAME CONSTRAINT '
+        'token_blacklist_unpartitioned_jti_key TO token_blacklist_jti_key'
+    )
@@ -3,10 +3,17 @@ import click
 from src.robot_management.models.robot import Robot
 from src.robot_management.models.task import Task
 from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.models.task_execution_rollup import TaskExecutionRollup
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.models.change_log import ChangeLog
 
 from src.robot_management import create_app, db
 from src.robot_management.models.user import User
 from src.robot_management.models.token_blacklist import BlacklistedToken
+from src.robot_management.api.task_executions.ingest import (
+    flush_ingest_queue,
+    get_ingest_queue,
+)
 
 app = create_app(os.getenv("FLASK_ENV", "development"))
 
@@ -19,7 +26,10 @@ def shell():
         "BlacklistedToken": BlacklistedToken,
         "Robot": Robot,
         "Task": Task,
-        "TaskExecution": TaskExecution
+        "TaskExecution": TaskExecution,
+        "TaskExecutionRollup": TaskExecutionRollup,
+        "TableVersion": TableVersion,
+        "ChangeLog": ChangeLog,
     }
 
 @app.cli.command("add-user", short_help="Add a new user")
@@ -41,3 +51,46 @@ def add_user(email, admin, password):
     message = f"Successfully added new {user_type}:\n {new_user}"
     click.secho(message, fg="blue", bold=True)
     return 0
+
+
+@app.cli.command("rebuild-rollups", short_help="Recompute task execution rollups")
+def rebuild_rollups():
+    """Discard and recompute every task execution rollup row from scratch."""
+    rows = TaskExecutionRollup.rebuild()
+    db.session.commit()
+    click.secho(f"Rebuilt {rows} task execution rollup rows", fg="blue", bold=True)
+    return 0
+
+
+@app.cli.command("purge-tokens", short_help="Delete expired blacklisted tokens")
+@click.option("--batch-size", default=1000, show_default=True, help="Rows per DELETE")
+def purge_tokens(batch_size):
+    """Delete expired token_blacklist rows and drop expired partitions."""
+    rows, partitions = BlacklistedToken.purge_expired(batch_size=batch_size)
+    message = f"Purged {rows} expired tokens, dropped {partitions} partitions"
+    click.secho(message, fg="blue", bold=True)
+    return 0
+
+
+@app.cli.command("purge-changes", short_help="Delete old change_log rows")
+@click.option("--days", default=30, show_default=True, help="Keep this many days")
+@click.option("--batch-size", default=1000, show_default=True, help="Rows per DELETE")
+def purge_changes(days, batch_size):
+    """Delete change_log rows older than DAYS; older sync cursors get 410 Gone."""
+    rows = ChangeLog.purge(days, batch_size=batch_size)
+    message = f"Purged {rows} changes, oldest available seq is {ChangeLog.floor() + 1}"
+    click.secho(message, fg="blue", bold=True)
+    return 0
+
+
+@app.cli.command("flush-ingest-queue", short_help="Insert queued task executions")
+def flush_ingest():
+    """Drain the async ingest journal into the task_execution table."""
+    inserted = flush_ingest_queue()
+    stats = get_ingest_queue().stats()
+    message = (
+        f"Inserted {inserted} task executions, {stats['pending']} pending, "
+        f"{stats['buried']} buried"
+    )
+    click.secho(message, fg="blue", bold=True)
+    return 0
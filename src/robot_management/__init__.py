@@ -3,19 +3,28 @@ from flask import Flask
 from flask_bcrypt import Bcrypt
 from flask_cors import CORS
 from flask_migrate import Migrate
-from flask_sqlalchemy import SQLAlchemy
 from werkzeug.utils import redirect
 from .config import get_config
+from .util.compression import Compress
+from .util.db_routing import RoutingSQLAlchemy
+from .util.instrumentation import Instrumentation
+from .util.response_cache import ResponseCache
+from .util.serialization import use_backend as use_json_backend
 
 cors = CORS()
-db = SQLAlchemy()
+db = RoutingSQLAlchemy()
 migrate = Migrate()
 bcrypt = Bcrypt()
+compress = Compress()
+response_cache = ResponseCache()
+instrumentation = Instrumentation()
 
 
 def create_app(config_name):
     app = Flask("Robot management")
     app.config.from_object(get_config(config_name))
+    # First, so its after_request runs last and includes compression time.
+    instrumentation.init_app(app)
     from src.robot_management.api import api_bp
 
     app.register_blueprint(api_bp)
@@ -23,9 +32,45 @@ def create_app(config_name):
     db.init_app(app)
     migrate.init_app(app, db)
     bcrypt.init_app(app)
+    compress.init_app(app)
+    response_cache.init_app(app)
+    use_json_backend(app.config.get("JSON_BACKEND"))
+    _start_token_purge(app)
+    _start_ingest_flusher(app)
 
     @app.route("/")
     def doc():
         return redirect("/api/ui")
 
     return app
+
+
+def _start_token_purge(app):
+    interval = app.config.get("TOKEN_PURGE_INTERVAL")
+    if not interval:
+        return
+    from src.robot_management.models.token_blacklist import BlacklistedToken
+    from src.robot_management.util.scheduler import PeriodicTask
+
+    batch_size = app.config.get("TOKEN_PURGE_BATCH_SIZE")
+    purge = PeriodicTask(
+        app,
+        interval,
+        lambda: BlacklistedToken.purge_expired(batch_size=batch_size),
+        name="token-purge",
+    )
+    purge.start()
+    app.extensions["token_purge"] = purge
+
+
+def _start_ingest_flusher(app):
+    if not app.config.get("TASK_EXECUTION_ASYNC_INGEST"):
+        return
+    from src.robot_management.api.task_executions.ingest import flush_ingest_queue
+    from src.robot_management.util.scheduler import PeriodicTask
+
+    flusher = PeriodicTask(
+        app, app.config.get("INGEST_FLUSH_INTERVAL"), flush_ingest_queue, name="ingest"
+    )
+    flusher.start()
+    app.extensions["ingest_flusher"] = flusher
@@ -5,6 +5,8 @@ from .auth.endpoints import auth_ns
 from .robots.endpoints import robot_ns
 from .tasks.endpoints import task_ns
 from .task_executions.endpoints import task_execution_ns
+from .diagnostics.endpoints import diagnostics_ns
+from .changes.endpoints import changes_ns
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 authorizations = {
@@ -27,3 +29,5 @@ api.add_namespace(auth_ns, path="/auth")
 api.add_namespace(robot_ns, path="/robots")
 api.add_namespace(task_ns, path="/tasks")
 api.add_namespace(task_execution_ns, path="/task-executions")
+api.add_namespace(diagnostics_ns, path="/diagnostics")
+api.add_namespace(changes_ns, path="/changes")
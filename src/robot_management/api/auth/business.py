@@ -1,24 +1,33 @@
 """Business logic for /auth API endpoints."""
+from contextlib import contextmanager
 from http import HTTPStatus
 
-from flask import current_app, jsonify
+from flask import current_app, jsonify, request
 from flask_restx import abort
+from werkzeug.exceptions import TooManyRequests
 
 from src.robot_management import db
+from src.robot_management.api.encoders import user_encoder
 from src.robot_management.models.user import User
 from src.robot_management.models.token_blacklist import BlacklistedToken
+from src.robot_management.util.failure_throttle import FailureThrottle
+from src.robot_management.util.serialization import json_response
+from src.robot_management.util.worker_pool import PoolSaturated
 from .decorators import token_required
 from src.robot_management.util.datetime_util import (
     remaining_fromtimestamp,
     format_timespan_digits,
 )
 
+login_failures = FailureThrottle()
+
 
 def process_registration_request(email, password):
     if User.find_by_email(email):
         current_app.logger.error(f"{email} is already registered")
         abort(HTTPStatus.CONFLICT, f"{email} is already registered", status="fail")
-    new_user = User(email=email, password=password)
+    with _hashing_capacity():
+        new_user = User(email=email, password=password)
     db.session.add(new_user)
     db.session.commit()
     current_app.logger.info(f"Created new user: {new_user}")
@@ -32,10 +41,20 @@ def process_registration_request(email, password):
 
 
 def process_login_request(email, password):
+    throttle_keys = _check_login_throttle(email)
     user = User.find_by_email(email)
-    if not user or not user.check_password(password):
+    with _hashing_capacity():
+        password_matches = user is not None and user.check_password(password)
+    if not password_matches:
+        window = current_app.config.get("LOGIN_FAILURE_WINDOW_SECONDS")
+        for key, _ in throttle_keys:
+            login_failures.record_failure(key, window)
         current_app.logger.warning("Email or password does not match")
-        abort(HTTPStatus.UNAUTHORIZED, "Email or password does not match", status="fail")
+        abort(HTTPStatus.UNAUTHORIZED, "email or password does not match", status="fail")
+    login_failures.reset(throttle_keys[0][0])
+    if db.session.is_modified(user):
+        db.session.commit()
+        current_app.logger.info(f"Rehashed password of {user}")
     access_token = user.encode_access_token()
     return _create_auth_successful_response(
         token=access_token,
@@ -52,21 +71,54 @@ def get_logged_in_user():
     expires_at = get_logged_in_user.expires_at
     user.token_expires_in = format_timespan_digits(remaining_fromtimestamp(expires_at))
     current_app.logger.debug(f"Token expires in: {user.token_expires_in}")
-    return user
+    return json_response(user_encoder(user))
 
 
 @token_required
 def process_logout_request():
     access_token = process_logout_request.token
+    jti = process_logout_request.jti
     expires_at = process_logout_request.expires_at
-    blacklisted_token = BlacklistedToken(access_token, expires_at)
+    blacklisted_token = BlacklistedToken(jti, expires_at)
     db.session.add(blacklisted_token)
     db.session.commit()
+    BlacklistedToken.remember(jti, expires_at)
+    User.forget_access_token(access_token)
     response_dict = dict(status="success", message="successfully logged out")
     current_app.logger.info("User logged out")
     return response_dict, HTTPStatus.OK
 
 
+def _check_login_throttle(email):
+    """Reject the login before any bcrypt work if email or client IP is blocked."""
+    config = current_app.config
+    throttle_keys = [
+        (("email", email.lower()), config.get("LOGIN_MAX_FAILURES_PER_EMAIL")),
+        (("ip", request.remote_addr), config.get("LOGIN_MAX_FAILURES_PER_IP")),
+    ]
+    for key, limit in throttle_keys:
+        retry_after = login_failures.retry_after(key, limit)
+        if retry_after:
+            current_app.logger.warning(f"Login throttled for {key[0]} {key[1]}")
+            error = TooManyRequests(retry_after=retry_after)
+            error.data = dict(status="fail", message="Too many failed login attempts")
+            raise error
+    return throttle_keys
+
+
+@contextmanager
+def _hashing_capacity():
+    try:
+        yield
+    except PoolSaturated as error:
+        current_app.logger.warning(f"Password hashing pool saturated: {error}")
+        abort(
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            "Too many login requests, please retry shortly",
+            status="fail",
+        )
+
+
 def _create_auth_successful_response(token, status_code, message):
     response = jsonify(
         status="success",
@@ -1,10 +1,11 @@
 """Decorators that decode and verify authorization tokens."""
 from functools import wraps
 
-from flask import request
+from flask import g, request
 
 from src.robot_management.api.exceptions import ApiUnauthorized, ApiForbidden
 from src.robot_management.models.user import User
+from src.robot_management.util.instrumentation import timed
 
 
 def token_required(f):
@@ -39,7 +40,8 @@ def _check_access_token(admin_only):
     token = request.headers.get("Authorization")
     if not token:
         raise ApiUnauthorized(description="Unauthorized", admin_only=admin_only)
-    result = User.decode_access_token(token)
+    with timed("auth"):
+        result = User.decode_access_token(token)
     if result.failure:
         raise ApiUnauthorized(
             description=result.error,
@@ -47,4 +49,5 @@ def _check_access_token(admin_only):
             error="invalid_token",
             error_description=result.error,
         )
+    g.token_payload = result.value
     return result.value
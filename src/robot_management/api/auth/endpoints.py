@@ -57,7 +57,6 @@ class GetUser(Resource):
     @auth_ns.response(int(HTTPStatus.OK), "Token is currently valid.", user_model)
     @auth_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
     @auth_ns.response(int(HTTPStatus.UNAUTHORIZED), "Token is invalid or expired.")
-    @auth_ns.marshal_with(user_model)
     def get(self):
         """Validate access token and return user info."""
         return get_logged_in_user()
@@ -0,0 +1,78 @@
+"""Read-through response caching for GET endpoints, invalidated by table versions."""
+import hashlib
+from functools import wraps
+from http import HTTPStatus
+
+from flask import Response, current_app, g, request
+
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.util.compression import representation_etags
+
+
+def cached_response(*tags):
+    """Cache the 200 responses of a GET business function.
+
+    tags are the table names whose TableVersion the response depends on. The
+    key hashes the route, the sorted query arguments, the Accept header (which
+    can select an export format), the caller's auth scope and the current
+    version of every tag, so a write that bumps one of them
+    changes the key: stale entries are never served and simply age out. The
+    key doubles as a strong ETag. Streamed responses (exports) pass through
+    uncached. Disabled when RESPONSE_CACHE_TTL is 0.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            ttl = current_app.config.get("RESPONSE_CACHE_TTL")
+            cache = current_app.extensions.get("response_cache")
+            if not ttl or cache is None:
+                return f(*args, **kwargs)
+            key = _cache_key(TableVersion.get_many(tags))
+            entry = cache.get(key)
+            if entry is None:
+                cache.misses += 1
+                response = f(*args, **kwargs)
+                if response.status_code != HTTPStatus.OK or response.is_streamed:
+                    return response
+                entry = (response.get_data(), response.mimetype)
+                cache.set(key, entry, ttl)
+                status = "MISS"
+            else:
+                cache.hits += 1
+                status = "HIT"
+            return _cached_response(key, entry, status)
+
+        return decorated
+
+    return decorator
+
+
+def _cache_key(versions):
+    payload = g.get("token_payload")
+    scope = "anonymous" if payload is None else ("admin" if payload["admin"] else "user")
+    parts = [
+        request.method,
+        request.path,
+        repr(sorted(request.args.items(multi=True))),
+        request.headers.get("Accept", ""),
+        scope,
+        repr(sorted(versions.items())),
+    ]
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cached_response(key, entry, status):
+    if request.if_none_match:
+        for etag in representation_etags(key):
+            if request.if_none_match.contains(etag):
+                response = Response(status=HTTPStatus.NOT_MODIFIED)
+                response.set_etag(etag)
+                return response
+    body, mimetype = entry
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(key)
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["X-Cache"] = status
+    response.vary.add("Accept")
+    return response
@@ -0,0 +1,100 @@
+"""Business logic for /changes API endpoints."""
+from http import HTTPStatus
+
+from flask import current_app
+from flask_restx import abort
+from sqlalchemy.orm import joinedload
+
+from src.robot_management.api.auth.decorators import token_required
+from src.robot_management.api.encoders import (
+    robot_list_encoder,
+    task_execution_encoder,
+    task_list_encoder,
+)
+from src.robot_management.models.change_log import ChangeLog
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.util.serialization import json_response
+
+
+def _load_task_executions(ids):
+    return TaskExecution.query.options(
+        joinedload(TaskExecution.robot, innerjoin=True),
+        joinedload(TaskExecution.task, innerjoin=True),
+    ).filter(TaskExecution.id.in_(ids))
+
+
+_ENTITIES = {
+    Robot.__tablename__: (
+        lambda ids: Robot.query.filter(Robot.id.in_(ids)),
+        robot_list_encoder,
+    ),
+    Task.__tablename__: (
+        lambda ids: Task.query.filter(Task.id.in_(ids)),
+        task_list_encoder,
+    ),
+    TaskExecution.__tablename__: (_load_task_executions, task_execution_encoder),
+}
+
+
+@token_required
+def retrieve_changes(since, limit):
+    if since is None:
+        current_app.logger.info("Current change seq requested")
+        latest = ChangeLog.latest(_settle_seconds())
+        return json_response(dict(changes=[], next=latest, more=False))
+    current_app.logger.info(f"Changes since {since} requested")
+    if since < ChangeLog.floor():
+        error = (
+            f"Changes up to {ChangeLog.floor()} are no longer available. Re-fetch "
+            "robots, tasks and task executions, then sync from the seq returned "
+            "by GET /changes before the re-fetch."
+        )
+        abort(HTTPStatus.GONE, error, status="fail")
+    limit = _get_page_size(limit)
+    rows = ChangeLog.since(since, limit + 1, _settle_seconds())
+    more = len(rows) > limit
+    rows = rows[:limit]
+    latest = {}
+    for row in rows:
+        latest.pop((row.entity, row.entity_id), None)
+        latest[(row.entity, row.entity_id)] = row
+    current = _load_current(row for row in latest.values() if not row.deleted)
+    changes = []
+    for (entity, id), row in latest.items():
+        data = None
+        if not row.deleted:
+            data = current.get((entity, id))
+            if data is None:
+                continue  # deleted by a later change
+        changes.append(
+            dict(seq=row.seq, entity=entity, id=id, deleted=row.deleted, data=data)
+        )
+    return json_response(
+        dict(changes=changes, next=rows[-1].seq if rows else since, more=more)
+    )
+
+
+def _load_current(rows):
+    """Encode the current state of changed rows, one query per entity."""
+    ids = {}
+    for row in rows:
+        ids.setdefault(row.entity, []).append(row.entity_id)
+    current = {}
+    for entity, entity_ids in ids.items():
+        load, encoder = _ENTITIES[entity]
+        for instance in load(entity_ids):
+            current[(entity, instance.id)] = encoder(instance)
+    return current
+
+
+def _settle_seconds():
+    return current_app.config.get("CHANGES_SETTLE_SECONDS")
+
+
+def _get_page_size(limit):
+    max_page_size = current_app.config.get("CHANGES_MAX_PAGE_SIZE")
+    if not limit:
+        limit = current_app.config.get("CHANGES_PAGE_SIZE")
+    return min(limit, max_page_size)
@@ -0,0 +1,31 @@
+from http import HTTPStatus
+
+from flask_restx import Namespace, Resource
+
+from src.robot_management.api.parsers import changes_reqparser
+from .business import retrieve_changes
+
+changes_ns = Namespace(name="changes", validate=True)
+
+
+@changes_ns.route("", endpoint="change_list")
+@changes_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@changes_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@changes_ns.response(int(HTTPStatus.GONE), "Changes were purged, full re-fetch needed.")
+@changes_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class ChangeList(Resource):
+    """Handles HTTP requests to URL: /changes."""
+
+    @changes_ns.doc(security="Bearer")
+    @changes_ns.response(int(HTTPStatus.OK), "Retrieved changes.")
+    @changes_ns.expect(changes_reqparser)
+    def get(self):
+        """Retrieve robots, tasks and task executions changed after a seq.
+
+        Each entry has the change seq, the entity ("robot", "task" or
+        "task_execution"), its id and its current data, or deleted=true and
+        no data for tombstones. Pass the returned next as since to continue;
+        more is true while further changes are waiting.
+        """
+        args = changes_reqparser.parse_args()
+        return retrieve_changes(args["since"], args["limit"])
@@ -0,0 +1,38 @@
+"""Business logic for /diagnostics API endpoints."""
+import os
+
+from flask import current_app
+
+from src.robot_management import db
+from src.robot_management.api.auth.decorators import admin_token_required
+from src.robot_management.api.task_executions.ingest import get_ingest_queue
+from src.robot_management.api.task_executions.stream import (
+    get_task_execution_broker,
+)
+from src.robot_management.models.user import get_hashing_pool
+from src.robot_management.util.db_pool import pool_stats
+from src.robot_management.util.db_routing import get_replicas
+from src.robot_management.util.serialization import json_response
+
+
+@admin_token_required
+def retrieve_pool_stats():
+    current_app.logger.info("Pool statistics requested")
+    replicas = get_replicas()
+    return json_response(
+        dict(
+            pid=os.getpid(),
+            database=pool_stats(db.engine),
+            replicas=[
+                dict(pool_stats(engine), **status)
+                for engine, status in zip(replicas.engines, replicas.stats())
+            ]
+            if replicas
+            else [],
+            password_hashing=get_hashing_pool().stats(),
+            ingest_queue=get_ingest_queue().stats()
+            if current_app.config.get("TASK_EXECUTION_ASYNC_INGEST")
+            else None,
+            task_execution_stream=get_task_execution_broker().stats(),
+        )
+    )
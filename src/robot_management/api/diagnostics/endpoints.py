@@ -0,0 +1,24 @@
+from http import HTTPStatus
+
+from flask_restx import Namespace, Resource
+
+from .business import retrieve_pool_stats
+
+diagnostics_ns = Namespace(name="diagnostics", validate=True)
+
+
+@diagnostics_ns.route("/pool", endpoint="diagnostics_pool")
+@diagnostics_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@diagnostics_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+@diagnostics_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class PoolStats(Resource):
+    """Handles HTTP requests to URL: /diagnostics/pool."""
+
+    @diagnostics_ns.doc(security="Bearer")
+    @diagnostics_ns.response(int(HTTPStatus.OK), "Retrieved pool statistics.")
+    def get(self):
+        """Retrieve database and password hashing pool statistics of this worker.
+
+        Each worker process has its own pools; poll repeatedly to sample them all.
+        """
+        return retrieve_pool_stats()
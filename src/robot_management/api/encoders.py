@@ -0,0 +1,27 @@
+"""Response encoders for the API models, matching the flask-restx models."""
+from src.robot_management.util.serialization import ModelEncoder
+
+robot_encoder = ModelEncoder({"name": "name", "type": "type"})
+robot_list_encoder = ModelEncoder({"id": "id", "name": "name", "type": "type"})
+task_encoder = ModelEncoder({"name": "name", "type": "type"})
+task_list_encoder = ModelEncoder({"id": "id", "name": "name", "type": "type"})
+task_execution_encoder = ModelEncoder(
+    {
+        "id": "id",
+        "robot": ("robot", robot_encoder),
+        "task": ("task", task_encoder),
+        "start": "start",
+        "end": "end",
+        "duration": "duration_str",
+        "status": "status",
+    }
+)
+user_encoder = ModelEncoder(
+    {
+        "email": "email",
+        "public_id": "public_id",
+        "admin": "admin",
+        "registered_on": "registered_on_str",
+        "token_expires_in": "token_expires_in",
+    }
+)
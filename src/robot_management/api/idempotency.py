@@ -0,0 +1,155 @@
+"""Idempotency-Key support for POST endpoints and per-item bulk deduplication."""
+import hashlib
+import os
+from functools import wraps
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+from flask import Response, current_app, g, request
+from flask_restx import abort
+
+from src.robot_management.util.expiring_store import ExpiringStore
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+_REPLAYED_HEADERS = ("Location",)
+
+
+def get_idempotency_store(app=None):
+    app = app or current_app
+    if "idempotency_store" not in app.extensions:
+        path = app.config.get("IDEMPOTENCY_STORE_PATH")
+        app.extensions["idempotency_store"] = ExpiringStore(
+            maxsize=app.config.get("IDEMPOTENCY_STORE_SIZE"),
+            path=os.path.join(app.instance_path, path) if path else None,
+        )
+    return app.extensions["idempotency_store"]
+
+
+def idempotent(f):
+    """Replay the stored response when a request repeats its Idempotency-Key.
+
+    Keys are scoped to the authenticated user and kept for
+    IDEMPOTENCY_KEY_TTL seconds, together with a digest of the request body:
+    reusing a key for a different body is rejected with 422, and a retry
+    that arrives while the first request is still running gets 409. Error
+    responses (and exceptions) release the key so the client can retry.
+    """
+
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            return f(*args, **kwargs)
+        if len(idempotency_key) > 255:
+            abort(
+                HTTPStatus.BAD_REQUEST,
+                f"{IDEMPOTENCY_HEADER} is too long.",
+                status="fail",
+            )
+        store = get_idempotency_store()
+        key = _scoped_key("request", idempotency_key)
+        fingerprint = _request_fingerprint()
+        if not _claim(store, key, fingerprint):
+            stored = store.get(key, cache=False)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+            if not _claim(store, key, fingerprint):
+                _abort_in_progress()
+        try:
+            response = f(*args, **kwargs)
+        except Exception:
+            store.delete_many([key])
+            raise
+        if response.status_code >= 400:
+            store.delete_many([key])
+            return response
+        headers = [
+            (name, response.headers[name])
+            for name in _REPLAYED_HEADERS
+            if name in response.headers
+        ]
+        saved = (response.status_code, response.get_data(), response.mimetype, headers)
+        store.set(key, (fingerprint, saved), ttl=_ttl())
+        return response
+
+    return decorated
+
+
+def claim_item_keys(items):
+    """Register the "idempotency_key" of each bulk item, returning (keys, duplicate flags).
+
+    Each lookup is a single probe of the expiring store, so a retried batch
+    that overlaps earlier ones only inserts the items not seen before.
+    Items without a key get None and are never flagged as duplicates.
+    """
+    keys = [_item_key(item) for item in items]
+    claimed = [key for key in keys if key is not None]
+    added = iter(get_idempotency_store().add_many(claimed, True, ttl=_ttl()))
+    duplicates = [key is not None and not next(added) for key in keys]
+    return keys, duplicates
+
+
+def release_item_keys(keys):
+    """Forget item keys registered by a bulk request that failed."""
+    get_idempotency_store().delete_many([key for key in keys if key is not None])
+
+
+def _claim(store, key, fingerprint):
+    # The in-progress marker only lives for the lease, so a worker that dies
+    # mid-request blocks the key briefly; set() stores the response for the
+    # full TTL. It is never cached in-process, since another worker replaces it.
+    lease = current_app.config.get("IDEMPOTENCY_LEASE_SECONDS")
+    return store.add(key, (fingerprint, None), ttl=lease, cache=False)
+
+
+def _abort_in_progress():
+    abort(
+        HTTPStatus.CONFLICT,
+        f"A request with this {IDEMPOTENCY_HEADER} is still being processed.",
+        status="fail",
+    )
+
+
+def _replay(stored, fingerprint):
+    stored_fingerprint, saved = stored
+    if stored_fingerprint != fingerprint:
+        abort(
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            f"{IDEMPOTENCY_HEADER} was already used with a different request.",
+            status="fail",
+        )
+    if saved is None:
+        _abort_in_progress()
+    status, data, mimetype, headers = saved
+    response = Response(data, status=status, mimetype=mimetype, headers=headers)
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+def _request_fingerprint():
+    # Form bodies have already been consumed by the request parser.
+    if request.form:
+        data = urlencode(sorted(request.form.items(multi=True)))
+        return _digest(data.encode("utf-8"))
+    return _digest(request.get_data())
+
+
+def _item_key(item):
+    if not isinstance(item, dict) or not item.get("idempotency_key"):
+        return None
+    return _scoped_key("item", str(item["idempotency_key"]))
+
+
+def _scoped_key(kind, value):
+    payload = g.get("token_payload") or {}
+    scope = f"{kind}\n{payload.get('public_id', '')}\n{value}"
+    return _digest(scope.encode("utf-8"))
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _ttl():
+    return current_app.config.get("IDEMPOTENCY_KEY_TTL")
@@ -1,14 +1,16 @@
 import re
+from flask_restx.inputs import natural, positive
 from flask_restx.reqparse import RequestParser
 from flask_restx import Model
-from flask_restx.fields import DateTime, Nested, String
+from flask_restx.fields import DateTime, Integer, Nested, String
 from dateutil import parser
 from datetime import date, datetime, time, timezone
 from src.robot_management.util.datetime_util import make_tzaware, DATE_MONTH_NAME
+from src.robot_management.util.pagination import decode_cursor
 
 
-from src.robot_management.models.robot import Robot
-from src.robot_management.models.task import Task
+from src.robot_management.models.robot import robot_index
+from src.robot_management.models.task import task_index
 
 
 def parse_name(name):
@@ -45,48 +47,63 @@ def future_date_from_string(date_str):
     return deadline_utc
 
 
+def utc_datetime_from_string(date_str):
+    """Validation method for a date/time string, normalized to naive UTC."""
+    try:
+        parsed_date = parser.parse(date_str)
+    except (ValueError, OverflowError):
+        raise ValueError(
+            f"Failed to parse '{date_str}' as a valid date. You can use any format "
+            "recognized by dateutil.parser, for example '2021-03-07T22:25:48Z'."
+        )
+    if parsed_date.tzinfo:
+        parsed_date = parsed_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed_date
+
+
 def robot_id(id):
-    robot = Robot.query.filter_by(id=id).first()
-    if not robot:
+    if not robot_index.has_id(_parse_id(id)):
         raise ValueError(f"Robot with id {id} does not exist")
-    return robot.id
+    return int(id)
 
 
 def task_id(id):
-    task = Task.query.filter_by(id=id).first()
-    if not task:
+    if not task_index.has_id(_parse_id(id)):
         raise ValueError(f"Task with id {id} does not exist")
-    return task.id
+    return int(id)
 
 
 def robot_from_name(name):
-    robot = Robot.find_by_name(name)
-    if not robot:
+    if not robot_index.has_name(name):
         raise ValueError(f"Robot with name {name} does not exist")
-    return robot.name
+    return name
 
 
 def robots_from_type(type):
-    robots = Robot.find_by_type(type)
-    if not robots:
+    if not robot_index.has_type(type):
         raise ValueError(f"Robots of type {type} does not exist")
     return type
 
 
 def task_from_name(name):
-    task = Task.find_by_name(name)
-    if not task:
+    if not task_index.has_name(name):
         raise ValueError(f"Task with name {name} does not exist")
-    return task.name
+    return name
 
 
 def tasks_from_type(type):
-    tasks = Task.find_by_type(type)
-    if not tasks:
+    if not task_index.has_type(type):
         raise ValueError(f"Tasks of type {type} does not exist")
     return type
 
 
+def _parse_id(id):
+    try:
+        return int(id)
+    except (TypeError, ValueError):
+        return None
+
+
 create_reqparser = RequestParser(bundle_errors=True)
 create_reqparser.add_argument(
     "name",
@@ -132,10 +149,65 @@ filter_reqparser.add_argument("robot_name", type=robot_from_name)
 filter_reqparser.add_argument("robot_type", type=robots_from_type)
 filter_reqparser.add_argument("task_name", type=task_from_name)
 filter_reqparser.add_argument("task_type", type=tasks_from_type)
-filter_reqparser.add_argument("start", type=datetime)
-filter_reqparser.add_argument("end", type=datetime)
-filter_reqparser.add_argument("duration", type=datetime)
-filter_reqparser.add_argument("status", type=str)
+filter_reqparser.add_argument(
+    "start",
+    type=utc_datetime_from_string,
+    help="Executions that started at or after this date/time.",
+)
+filter_reqparser.add_argument(
+    "end",
+    type=utc_datetime_from_string,
+    help="Executions that ended at or before this date/time.",
+)
+filter_reqparser.add_argument(
+    "status", type=str, choices=["Success", "Failed", "Failure"]
+)
+
+task_execution_list_reqparser = filter_reqparser.copy()
+task_execution_list_reqparser.add_argument(
+    "limit", type=positive, help="Page size (capped by the server)."
+)
+task_execution_list_reqparser.add_argument(
+    "cursor", type=decode_cursor, help="Opaque next/prev cursor of a previous page."
+)
+task_execution_list_reqparser.add_argument(
+    "format",
+    type=str,
+    choices=["json", "ndjson", "csv"],
+    help="Stream every matching execution as NDJSON or CSV instead of a page.",
+)
+
+stream_reqparser = RequestParser(bundle_errors=True)
+stream_reqparser.add_argument("robot_name", type=robot_from_name)
+stream_reqparser.add_argument("robot_type", type=robots_from_type)
+stream_reqparser.add_argument("task_name", type=task_from_name)
+stream_reqparser.add_argument("task_type", type=tasks_from_type)
+stream_reqparser.add_argument(
+    "last_event_id",
+    type=int,
+    help="Resume after this execution id (same as the Last-Event-ID header).",
+)
+
+stats_reqparser = filter_reqparser.copy()
+stats_reqparser.add_argument(
+    "group_by",
+    type=str,
+    action="append",
+    choices=["robot_name", "robot_type", "task_name", "task_type", "status"],
+    help="Repeat to group by several dimensions.",
+)
+stats_reqparser.add_argument(
+    "bucket",
+    type=str,
+    choices=["hour", "day", "week"],
+    help="Also group by the start time truncated to this interval.",
+)
+stats_reqparser.add_argument(
+    "source",
+    type=str,
+    choices=["raw", "rollup"],
+    help="rollup reads pre-aggregated hourly counters instead of every execution.",
+)
 
 
 robot_model = Model(
@@ -149,13 +221,24 @@ task_model = Model("Task", {"name": String, "type": String})
 task_execution_model = Model(
     "Task execution",
     {
+        "id": Integer,
         "robot": Nested(robot_model),
         "task": Nested(task_model),
         "start": DateTime,
         "end": DateTime,
-        "duration": String(attribute="deadline_str"),
+        "duration": String(attribute="duration_str"),
         "status": String,
     },
 )
 
 update_reqparser = create_reqparser.copy()
+
+changes_reqparser = RequestParser(bundle_errors=True)
+changes_reqparser.add_argument(
+    "since",
+    type=natural,
+    help="Return changes after this seq; omit to get the current seq only.",
+)
+changes_reqparser.add_argument(
+    "limit", type=positive, help="Maximum changes to read (capped by the server)."
+)
@@ -5,12 +5,17 @@ from flask import jsonify, url_for, current_app
 from flask_restx import abort
 
 from src.robot_management import db
+from src.robot_management.api.encoders import robot_encoder, robot_list_encoder
 from src.robot_management.api.auth.decorators import (
     token_required,
     admin_token_required,
 )
 from src.robot_management.api.parsers import parse_name
-from src.robot_management.models.robot import Robot
+from src.robot_management.models.robot import Robot, robot_index
+from src.robot_management.models.change_log import ChangeLog
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.util.conditional import conditional_response
+from src.robot_management.util.serialization import json_response
 
 
 @admin_token_required
@@ -22,7 +27,11 @@ def create_robot(robot_dict):
         abort(HTTPStatus.CONFLICT, error, status="fail")
     robot = Robot(**robot_dict)
     db.session.add(robot)
+    db.session.flush()
+    TableVersion.bump(Robot.__tablename__)
+    ChangeLog.record(Robot.__tablename__, [robot.id])
     db.session.commit()
+    robot_index.invalidate()
     response = jsonify(status="success", message=f"New robot added: {name}.")
     current_app.logger.info(f"Added robot: {robot}")
     response.status_code = HTTPStatus.CREATED
@@ -32,15 +41,22 @@ def create_robot(robot_dict):
 
 def retrieve_robot_list():
     current_app.logger.info("Robot list requested")
-    response = jsonify(Robot.query.all())
-    return response
+    version, updated_at = TableVersion.get(Robot.__tablename__)
+    return conditional_response(
+        Robot.__tablename__,
+        version,
+        updated_at,
+        lambda: json_response(robot_list_encoder.many(Robot.query.all())),
+        cache_control="no-cache",
+    )
 
 
 def retrieve_robot(name):
     current_app.logger.info(f"Robot {name} requested")
-    return Robot.query.filter_by(name=name.lower()).first_or_404(
+    robot = Robot.query.filter_by(name=name.lower()).first_or_404(
         description=f"{name} not found."
     )
+    return json_response(robot_encoder(robot))
 
 
 @token_required
@@ -49,7 +65,10 @@ def update_robot(name, robot_dict):
     if robot:
         for k, v in robot_dict.items():
             setattr(robot, k, v)
+        TableVersion.bump(Robot.__tablename__)
+        ChangeLog.record(Robot.__tablename__, [robot.id])
         db.session.commit()
+        robot_index.invalidate()
         message = f"'{name}' was successfully updated"
         current_app.logger.info(message)
         response_dict = dict(status="success", message=message)
@@ -70,6 +89,9 @@ def delete_robot(name):
         description=f"{name} not found in database."
     )
     db.session.delete(robot)
+    TableVersion.bump(Robot.__tablename__)
+    ChangeLog.record(Robot.__tablename__, [robot.id], deleted=True)
     db.session.commit()
+    robot_index.invalidate()
     current_app.logger.info(f"Robot {name} deleted")
     return "", HTTPStatus.NO_CONTENT
@@ -52,7 +52,6 @@ class Robot(Resource):
     """Handles HTTP requests to URL: /robots/{name}."""
 
     @robot_ns.response(int(HTTPStatus.OK), "Retrieved robot.", robot_model)
-    @robot_ns.marshal_with(robot_model)
     def get(self, name):
         """Retrieve a robot."""
         return retrieve_robot(name)
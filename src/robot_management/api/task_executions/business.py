@@ -1,54 +1,333 @@
 """Business logic for /task-executions API endpoints."""
+from contextlib import contextmanager
 from http import HTTPStatus
 
-from flask import jsonify, url_for, current_app
+from flask import (
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+    url_for,
+)
+from flask_restx import abort
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 from src.robot_management import db
-from src.robot_management.api.auth.decorators import token_required
+from src.robot_management.api.auth.decorators import (
+    admin_token_required,
+    token_required,
+)
+from src.robot_management.api.caching import cached_response
+from src.robot_management.api.idempotency import (
+    claim_item_keys,
+    idempotent,
+    release_item_keys,
+)
+from src.robot_management.api.encoders import task_execution_encoder
+from src.robot_management.models.change_log import ChangeLog
 from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.models.robot import Robot, robot_index
+from src.robot_management.models.task import Task, task_index
+from src.robot_management.models.task_execution_rollup import TaskExecutionRollup
+from src.robot_management.util.datetime_util import utc_now
+from src.robot_management.util.pagination import keyset_paginate
+from src.robot_management.util.serialization import json_response
+from .export import EXPORT_MIMETYPES, export_task_executions
+from .filters import filter_task_executions
+from .ingest import (
+    bump_task_execution_version,
+    enqueue_task_executions,
+    insert_task_executions,
+    parse_bulk_body,
+    status_to_success,
+    validate_task_execution_item,
+)
+from .stream import publish_task_execution, stream_task_executions
+from .stats import (
+    ROLLUP_FILTERS,
+    ROLLUP_GROUP_BY_CHOICES,
+    aggregate_task_execution_rollups,
+    aggregate_task_executions,
+)
+
+_CACHE_TAGS = (TaskExecution.__tablename__, Robot.__tablename__, Task.__tablename__)
 
 
 @token_required
+@idempotent
 def create_task_execution(task_execution_dict):
-    start = task_execution_dict.get("start")
-    if not start:
-        task_execution_dict.pop("start")
+    if not task_execution_dict.get("start"):
+        task_execution_dict["start"] = utc_now()
     status = task_execution_dict.pop("status", "Failed")
-    task_execution_dict["success"] = status != "Failed"
+    task_execution_dict["success"] = status_to_success(status)
+    if current_app.config.get("TASK_EXECUTION_ASYNC_INGEST"):
+        receipts = enqueue_task_executions([task_execution_dict])
+        return _create_accepted_response(receipts, errors=None)
     task_execution = TaskExecution(**task_execution_dict)
-    db.session.add(task_execution)
+    with _rejecting_stale_dimensions():
+        db.session.add(task_execution)
+        db.session.flush()
+    TaskExecutionRollup.apply([task_execution_dict])
+    bump_task_execution_version()
+    ChangeLog.record(TaskExecution.__tablename__, [task_execution.id])
     db.session.commit()
     response = jsonify(
         status="success",
         message=f"New task execution added: {task_execution.robot}: {task_execution.task}.",
     )
     current_app.logger.info("Added new task execution")
+    publish_task_execution(task_execution)
     response.status_code = HTTPStatus.CREATED
     response.headers["Location"] = url_for("api.task_execution", id=task_execution.id)
     return response
 
 
 @token_required
+@idempotent
+def create_task_execution_bulk():
+    max_items = current_app.config.get("BULK_INGEST_MAX_ITEMS")
+    try:
+        items = parse_bulk_body(request, max_items)
+    except OverflowError as e:
+        abort(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, str(e), status="fail")
+    except ValueError as e:
+        abort(HTTPStatus.BAD_REQUEST, str(e), status="fail")
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        row, item_errors = validate_task_execution_item(item)
+        if item_errors:
+            errors.append(dict(index=index, errors=item_errors))
+        else:
+            valid.append((index, item, row))
+    if not valid:
+        abort(
+            HTTPStatus.BAD_REQUEST,
+            "No valid task executions in request.",
+            status="fail",
+            errors=errors,
+        )
+    keys, is_duplicate = claim_item_keys([item for _, item, _ in valid])
+    duplicates = [index for (index, _, _), dup in zip(valid, is_duplicate) if dup]
+    rows = [row for (_, _, row), dup in zip(valid, is_duplicate) if not dup]
+    keys = [key for key, dup in zip(keys, is_duplicate) if not dup]
+    try:
+        if current_app.config.get("TASK_EXECUTION_ASYNC_INGEST"):
+            receipts = enqueue_task_executions(rows) if rows else []
+            return _create_accepted_response(receipts, errors, duplicates)
+        ids = _insert_bulk_rows(rows)
+    except Exception:
+        release_item_keys(keys)
+        raise
+    current_app.logger.info(f"Added {len(ids)} task executions in bulk")
+    response = jsonify(
+        status="success",
+        message=(
+            f"{len(ids)} task executions added, {len(errors)} rejected, "
+            f"{len(duplicates)} duplicates skipped."
+        ),
+        ids=ids,
+        errors=errors,
+        duplicates=duplicates,
+    )
+    response.status_code = HTTPStatus.CREATED
+    return response
+
+
+@token_required
+@cached_response(*_CACHE_TAGS)
 def retrieve_task_execution_list(filter_dict):
     current_app.logger.info("Task execution list requested")
-    filter_dict = dict(filter(lambda x: x[1], filter_dict.items()))
-    task_executions = [
-        te for te in TaskExecution.query.all() if _match(te, filter_dict)
-    ]
-    response = jsonify(task_executions)
+    filter_dict = dict(filter_dict)
+    cursor = filter_dict.pop("cursor", None)
+    limit = _get_page_size(filter_dict.pop("limit", None))
+    export_format = _get_export_format(filter_dict.pop("format", None))
+    if export_format:
+        return _create_export_response(filter_dict, export_format)
+    page = keyset_paginate(
+        filter_task_executions(filter_dict),
+        (TaskExecution.start, TaskExecution.id),
+        cursor=cursor,
+        limit=limit,
+    )
+    return json_response(
+        dict(
+            task_executions=task_execution_encoder.many(page.items),
+            next=page.next,
+            prev=page.prev,
+        )
+    )
+
+
+@token_required
+@cached_response(*_CACHE_TAGS)
+def retrieve_task_execution_stats(filter_dict):
+    current_app.logger.info("Task execution statistics requested")
+    filter_dict = dict(filter_dict)
+    group_by = filter_dict.pop("group_by", None)
+    bucket = filter_dict.pop("bucket", None)
+    source = filter_dict.pop("source", None) or "raw"
+    if source == "rollup":
+        _check_rollup_arguments(filter_dict, group_by)
+        aggregate = aggregate_task_execution_rollups
+    else:
+        aggregate = aggregate_task_executions
+    stats = aggregate(filter_dict, group_by=group_by, bucket=bucket)
+    return jsonify(group_by=group_by or [], bucket=bucket, source=source, stats=stats)
+
+
+@token_required
+def stream_task_execution_list(filter_dict):
+    filter_dict = dict(filter_dict)
+    last_event_id = filter_dict.pop("last_event_id", None)
+    header = request.headers.get("Last-Event-ID")
+    if header:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            abort(
+                HTTPStatus.BAD_REQUEST,
+                "Last-Event-ID must be an integer.",
+                status="fail",
+            )
+    current_app.logger.info("Task execution stream requested")
+    response = Response(
+        stream_with_context(stream_task_executions(filter_dict, last_event_id)),
+        mimetype="text/event-stream",
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
     return response
 
 
 @token_required
 def retrieve_task_execution(id):
     current_app.logger.info(f"Task execution {id} requested")
-    return TaskExecution.query.filter_by(id=id).first_or_404(
+    query = TaskExecution.query.options(
+        joinedload(TaskExecution.robot, innerjoin=True),
+        joinedload(TaskExecution.task, innerjoin=True),
+    )
+    task_execution = query.filter_by(id=id).first_or_404(
         description=f"Task execution [{id}] not found."
     )
+    return json_response(task_execution_encoder(task_execution))
 
 
-def _match(te: TaskExecution, filter_dict: dict):
-    for k, v in filter_dict.items():
-        if getattr(te, k) != v:
-            return False
-    return True
\ No newline at end of file
+@admin_token_required
+def delete_task_execution(id):
+    task_execution = TaskExecution.query.filter_by(id=id).first_or_404(
+        description=f"Task execution [{id}] not found in database."
+    )
+    TaskExecutionRollup.apply([task_execution], sign=-1)
+    db.session.delete(task_execution)
+    bump_task_execution_version()
+    ChangeLog.record(
+        TaskExecution.__tablename__, [task_execution.id], deleted=True
+    )
+    db.session.commit()
+    current_app.logger.info(f"Task execution {id} deleted")
+    return "", HTTPStatus.NO_CONTENT
+
+
+def _insert_bulk_rows(rows):
+    if not rows:
+        return []
+    chunk_size = current_app.config.get("BULK_INSERT_CHUNK_SIZE")
+    with _rejecting_stale_dimensions():
+        ids = insert_task_executions(rows, chunk_size=chunk_size)
+    TaskExecutionRollup.apply(rows)
+    bump_task_execution_version()
+    ChangeLog.record(TaskExecution.__tablename__, ids)
+    db.session.commit()
+    return ids
+
+
+@contextmanager
+def _rejecting_stale_dimensions():
+    # The robot/task indexes may still list a row another worker deleted;
+    # the foreign key then fails, which is a client error, not a 500.
+    try:
+        yield
+    except IntegrityError as e:
+        if not _is_foreign_key_violation(e):
+            raise
+        db.session.rollback()
+        robot_index.invalidate()
+        task_index.invalidate()
+        error = "Robot or task does not exist."
+        current_app.logger.error(error)
+        abort(HTTPStatus.BAD_REQUEST, error, status="fail")
+
+
+def _is_foreign_key_violation(error):
+    if getattr(error.orig, "pgcode", None) == "23503":
+        return True
+    return "foreign key" in str(error.orig).lower()
+
+
+def _create_accepted_response(receipts, errors, duplicates=None):
+    current_app.logger.info(f"Queued {len(receipts)} task executions")
+    if errors is None:
+        response = jsonify(
+            status="success", message="Task execution accepted.", id=receipts[0]
+        )
+    else:
+        response = jsonify(
+            status="success",
+            message=(
+                f"{len(receipts)} task executions accepted, {len(errors)} rejected, "
+                f"{len(duplicates)} duplicates skipped."
+            ),
+            ids=receipts,
+            errors=errors,
+            duplicates=duplicates,
+        )
+    response.status_code = HTTPStatus.ACCEPTED
+    return response
+
+
+def _get_page_size(limit):
+    max_page_size = current_app.config.get("TASK_EXECUTION_MAX_PAGE_SIZE")
+    if not limit:
+        limit = current_app.config.get("TASK_EXECUTION_PAGE_SIZE")
+    return min(limit, max_page_size)
+
+
+def _get_export_format(format):
+    if not format:
+        format = request.accept_mimetypes.best_match(
+            ["application/json"] + list(EXPORT_MIMETYPES.values())
+        )
+        format = {v: k for k, v in EXPORT_MIMETYPES.items()}.get(format)
+    return format if format in EXPORT_MIMETYPES else None
+
+
+def _create_export_response(filter_dict, export_format):
+    current_app.logger.info(f"Task execution {export_format} export requested")
+    chunk_rows = current_app.config.get("EXPORT_CHUNK_ROWS")
+    rows = export_task_executions(filter_dict, export_format, chunk_rows=chunk_rows)
+    response = Response(
+        stream_with_context(rows), mimetype=EXPORT_MIMETYPES[export_format]
+    )
+    if export_format == "csv":
+        response.headers["Content-Disposition"] = (
+            "attachment; filename=task_executions.csv"
+        )
+    return response
+
+
+def _check_rollup_arguments(filter_dict, group_by):
+    unsupported = [
+        name
+        for name, value in filter_dict.items()
+        if value is not None and name not in ROLLUP_FILTERS
+    ]
+    unsupported += [
+        name for name in group_by or [] if name not in ROLLUP_GROUP_BY_CHOICES
+    ]
+    if unsupported:
+        error = f"Not available with source=rollup: {', '.join(unsupported)}."
+        current_app.logger.error(error)
+        abort(HTTPStatus.BAD_REQUEST, error, status="fail")
@@ -5,12 +5,18 @@ from flask_restx import Namespace, Resource
 from src.robot_management.api.parsers import (
     task_execution_model,
     task_execution_reqparser,
-    filter_reqparser
+    task_execution_list_reqparser,
+    stats_reqparser,
+    stream_reqparser,
 )
 from .business import (
     create_task_execution,
+    create_task_execution_bulk,
     retrieve_task_execution_list,
+    retrieve_task_execution_stats,
+    stream_task_execution_list,
     retrieve_task_execution,
+    delete_task_execution,
 )
 
 task_execution_ns = Namespace(name="task_executions", validate=True)
@@ -26,10 +32,10 @@ class TaskList(Resource):
 
     @task_execution_ns.doc(security="Bearer")
     @task_execution_ns.response(int(HTTPStatus.OK), "Retrieved task execution list.")
-    @task_execution_ns.expect(filter_reqparser)
+    @task_execution_ns.expect(task_execution_list_reqparser)
     def get(self):
-        """Retrieve a list of task executions."""
-        filter_dict = filter_reqparser.parse_args()
+        """Retrieve a page of task executions, ordered by start time."""
+        filter_dict = task_execution_list_reqparser.parse_args()
         return retrieve_task_execution_list(filter_dict)
 
     @task_execution_ns.doc(security="Bearer")
@@ -42,6 +48,61 @@ class TaskList(Resource):
         return create_task_execution(task_execution_dict)
 
 
+@task_execution_ns.route("/bulk", endpoint="task_execution_bulk")
+@task_execution_ns.response(int(HTTPStatus.BAD_REQUEST), "No valid task executions.")
+@task_execution_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@task_execution_ns.response(int(HTTPStatus.REQUEST_ENTITY_TOO_LARGE), "Too many items.")
+@task_execution_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class TaskExecutionBulk(Resource):
+    """Handles HTTP requests to URL: /task-executions/bulk."""
+
+    @task_execution_ns.doc(security="Bearer")
+    @task_execution_ns.response(int(HTTPStatus.CREATED), "Added task executions.")
+    def post(self):
+        """Create many task executions from a JSON array or NDJSON body.
+
+        Each item has robot_id or robot_name, task_id or task_name, an optional
+        start, end and status. Invalid items are reported by index and skipped.
+        """
+        return create_task_execution_bulk()
+
+
+@task_execution_ns.route("/stream", endpoint="task_execution_stream")
+@task_execution_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@task_execution_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@task_execution_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class TaskExecutionStream(Resource):
+    """Handles HTTP requests to URL: /task-executions/stream."""
+
+    @task_execution_ns.doc(security="Bearer")
+    @task_execution_ns.response(int(HTTPStatus.OK), "Server-sent events stream.")
+    @task_execution_ns.expect(stream_reqparser)
+    def get(self):
+        """Stream new task executions as server-sent events.
+
+        Each event's id is the execution id; reconnecting with Last-Event-ID
+        (or last_event_id) replays the executions created since then.
+        """
+        filter_dict = stream_reqparser.parse_args()
+        return stream_task_execution_list(filter_dict)
+
+
+@task_execution_ns.route("/stats", endpoint="task_execution_stats")
+@task_execution_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@task_execution_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@task_execution_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class TaskExecutionStats(Resource):
+    """Handles HTTP requests to URL: /task-executions/stats."""
+
+    @task_execution_ns.doc(security="Bearer")
+    @task_execution_ns.response(int(HTTPStatus.OK), "Retrieved statistics.")
+    @task_execution_ns.expect(stats_reqparser)
+    def get(self):
+        """Retrieve counts, success ratio and durations of task executions."""
+        filter_dict = stats_reqparser.parse_args()
+        return retrieve_task_execution_stats(filter_dict)
+
+
 @task_execution_ns.route("/<id>", endpoint="task_execution")
 @task_execution_ns.param("id", "task execution id")
 @task_execution_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
@@ -53,7 +114,13 @@ class Task(Resource):
 
     @task_execution_ns.doc(security="Bearer")
     @task_execution_ns.response(int(HTTPStatus.OK), "Retrieved task execution.", task_execution_model)
-    @task_execution_ns.marshal_with(task_execution_model)
     def get(self, id):
         """Retrieve a task execution."""
         return retrieve_task_execution(id)
+
+    @task_execution_ns.doc(security="Bearer")
+    @task_execution_ns.response(int(HTTPStatus.NO_CONTENT), "Task execution was deleted.")
+    @task_execution_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+    def delete(self, id):
+        """Delete a task execution."""
+        return delete_task_execution(id)
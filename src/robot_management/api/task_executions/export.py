@@ -0,0 +1,92 @@
+"""Streaming NDJSON/CSV export of filtered task executions."""
+import csv
+import io
+
+from src.robot_management import db
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.util.serialization import dumps
+from .filters import apply_task_execution_filters
+
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_COLUMNS = (
+    "id",
+    "robot_name",
+    "robot_type",
+    "task_name",
+    "task_type",
+    "start",
+    "end",
+    "status",
+)
+
+
+def export_task_executions(filter_dict, format, chunk_rows=1000):
+    """Yield the filtered executions as NDJSON or CSV text, chunk by chunk.
+
+    Only plain columns are selected (no ORM entities) and results are read
+    through a server-side cursor in batches of chunk_rows, so memory use does
+    not grow with the number of exported rows.
+    """
+    query = db.session.query(
+        TaskExecution.id,
+        Robot.name,
+        Robot.type,
+        Task.name,
+        Task.type,
+        TaskExecution.start,
+        TaskExecution.end,
+        TaskExecution.success,
+    ).select_from(TaskExecution)
+    query = (
+        apply_task_execution_filters(query, filter_dict)
+        .order_by(TaskExecution.start, TaskExecution.id)
+        .execution_options(stream_results=True)
+        .yield_per(chunk_rows)
+    )
+    write_rows = _write_csv if format == "csv" else _write_ndjson
+    buffer = io.StringIO()
+    if format == "csv":
+        csv.writer(buffer).writerow(EXPORT_COLUMNS)
+        yield _drain(buffer)
+    batch = []
+    for row in query:
+        batch.append(row)
+        if len(batch) == chunk_rows:
+            write_rows(buffer, batch)
+            yield _drain(buffer)
+            batch = []
+    write_rows(buffer, batch)
+    yield _drain(buffer)
+
+
+def _export_values(row):
+    id, robot_name, robot_type, task_name, task_type, start, end, success = row
+    return (
+        id,
+        robot_name,
+        robot_type,
+        task_name,
+        task_type,
+        start.isoformat() if start else None,
+        end.isoformat() if end else None,
+        "Success" if success else "Failed",
+    )
+
+
+def _write_ndjson(buffer, rows):
+    for row in rows:
+        buffer.write(dumps(dict(zip(EXPORT_COLUMNS, _export_values(row)))).decode())
+        buffer.write("\n")
+
+
+def _write_csv(buffer, rows):
+    csv.writer(buffer).writerows(_export_values(row) for row in rows)
+
+
+def _drain(buffer):
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
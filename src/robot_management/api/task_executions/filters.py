@@ -0,0 +1,48 @@
+"""Translate /task-executions filter arguments into SQL predicates."""
+from sqlalchemy.orm import contains_eager
+
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+
+
+def _status_predicate(status):
+    if status == "Success":
+        return TaskExecution.success.is_(True)
+    return TaskExecution.success.isnot(True)
+
+
+_PREDICATES = {
+    "robot_name": lambda v: Robot.name == v,
+    "robot_type": lambda v: Robot.type == v,
+    "task_name": lambda v: Task.name == v,
+    "task_type": lambda v: Task.type == v,
+    "start": lambda v: TaskExecution.start >= v,
+    "end": lambda v: TaskExecution.end <= v,
+    "status": _status_predicate,
+}
+
+
+def filter_task_executions(filter_dict, query=None):
+    """Apply every non-empty filter from filter_reqparser to a TaskExecution query.
+
+    Robot and task tables are joined so that name/type filters are evaluated
+    by the database, and the joined rows populate the robot/task relationships
+    so serializing the result does not issue one SELECT per execution.
+    """
+    if query is None:
+        query = TaskExecution.query
+    return apply_task_execution_filters(query, filter_dict).options(
+        contains_eager(TaskExecution.robot),
+        contains_eager(TaskExecution.task),
+    )
+
+
+def apply_task_execution_filters(query, filter_dict):
+    """Join robot and task to a query on task_execution and add the filters."""
+    query = query.join(TaskExecution.robot).join(TaskExecution.task)
+    for name, value in filter_dict.items():
+        if value is None or name not in _PREDICATES:
+            continue
+        query = query.filter(_PREDICATES[name](value))
+    return query
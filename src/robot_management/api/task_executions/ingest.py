@@ -0,0 +1,233 @@
+"""Parsing, validation and multi-row insertion of task execution batches."""
+import json
+import os
+from uuid import uuid4
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.robot_management import db
+from src.robot_management.api.parsers import utc_datetime_from_string
+from src.robot_management.models.change_log import ChangeLog
+from src.robot_management.models.robot import robot_index
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.models.task import task_index
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.models.task_execution_rollup import TaskExecutionRollup
+from src.robot_management.util.datetime_util import utc_now
+from src.robot_management.util.durable_queue import DurableQueue
+
+STATUS_CHOICES = ("Success", "Failure", "Failed")
+
+
+def status_to_success(status):
+    """Map the status argument of a task execution to its success column."""
+    return status == "Success"
+
+
+def parse_bulk_body(request, max_items):
+    """Read a JSON array or NDJSON request body into a list of item dicts."""
+    if request.mimetype in ("application/x-ndjson", "application/jsonl"):
+        lines = request.get_data(as_text=True).splitlines()
+        items = [json.loads(line) for line in lines if line.strip()]
+    else:
+        items = request.get_json(force=True)
+    if not isinstance(items, list):
+        raise ValueError("Request body must be a JSON array or NDJSON stream.")
+    if len(items) > max_items:
+        raise OverflowError(f"A batch can contain at most {max_items} items.")
+    return items
+
+
+def validate_task_execution_item(item):
+    """Validate one batch item against the in-memory robot/task indexes.
+
+    Returns a (row, errors) tuple, where row holds task_execution column values
+    and errors maps argument names to messages (row is None if errors exist).
+    """
+    if not isinstance(item, dict):
+        return None, {"item": "Each item must be a JSON object."}
+    errors = {}
+    row = {}
+    for dimension, index in (("robot", robot_index), ("task", task_index)):
+        value = _resolve_dimension_id(item, dimension, index)
+        if isinstance(value, str):
+            errors[dimension] = value
+        else:
+            row[f"{dimension}_id"] = value
+    for name in ("start", "end"):
+        value = item.get(name)
+        if value is None:
+            if name == "end":
+                errors[name] = "Missing required parameter."
+            continue
+        try:
+            row[name] = utc_datetime_from_string(str(value))
+        except ValueError as e:
+            errors[name] = str(e)
+    if "start" in row and "end" in row and row["end"] < row["start"]:
+        errors["end"] = "end must not be before start."
+    status = item.get("status")
+    if status not in STATUS_CHOICES:
+        errors["status"] = f"status must be one of {', '.join(STATUS_CHOICES)}."
+    else:
+        row["success"] = status_to_success(status)
+    if errors:
+        return None, errors
+    row.setdefault("start", None)
+    return row, {}
+
+
+def insert_task_executions(rows, chunk_size=1000):
+    """Insert rows with multi-row INSERT statements, returning their new ids.
+
+    Runs inside the current session transaction; the caller commits. Dialects
+    without INSERT .. RETURNING (SQLite) fall back to one statement per row.
+    """
+    if not rows:
+        return []
+    table = TaskExecution.__table__
+    now = utc_now()
+    for row in rows:
+        if row.get("start") is None:
+            row["start"] = now
+    ids = []
+    if db.engine.dialect.implicit_returning:
+        for offset in range(0, len(rows), chunk_size):
+            chunk = rows[offset : offset + chunk_size]
+            statement = table.insert().values(chunk).returning(table.c.id)
+            ids.extend(id for (id,) in db.session.execute(statement))
+    else:
+        for row in rows:
+            result = db.session.execute(table.insert().values(**row))
+            ids.append(result.inserted_primary_key[0])
+    return ids
+
+
+def bump_task_execution_version():
+    """TableVersion.bump() for task_execution, on one of its shard rows."""
+    TableVersion.bump(
+        TaskExecution.__tablename__,
+        shards=current_app.config.get("TASK_EXECUTION_VERSION_SHARDS"),
+    )
+
+
+def get_ingest_queue(app=None):
+    """The journal of task executions accepted in async ingest mode."""
+    app = app or current_app
+    if "ingest_queue" not in app.extensions:
+        app.extensions["ingest_queue"] = DurableQueue(
+            os.path.join(app.instance_path, app.config.get("INGEST_QUEUE_PATH")),
+            lease_seconds=app.config.get("INGEST_LEASE_SECONDS"),
+        )
+    return app.extensions["ingest_queue"]
+
+
+def enqueue_task_executions(rows):
+    """Journal validated rows for flush_ingest_queue, returning their receipts.
+
+    start defaults to the time of acceptance, not the time of the flush.
+    """
+    now = utc_now()
+    payloads = []
+    for row in rows:
+        start = row.get("start") or now
+        end = row.get("end")
+        payloads.append(
+            dict(
+                receipt=uuid4().hex,
+                robot_id=row["robot_id"],
+                task_id=row["task_id"],
+                start=start.isoformat(),
+                end=end.isoformat() if end else None,
+                success=row["success"],
+            )
+        )
+    get_ingest_queue().put(payloads)
+    return [payload["receipt"] for payload in payloads]
+
+
+def flush_ingest_queue():
+    """Insert journaled task executions until the queue is drained.
+
+    Each batch is inserted and committed with its rollups, then removed from
+    the journal; a crash in between re-delivers the batch after its lease, so
+    delivery is at least once. If a batch fails, its rows are retried one by
+    one: failing rows are released for the next flush and buried once they
+    have failed INGEST_MAX_ATTEMPTS times. Returns the number of rows inserted.
+    """
+    config = current_app.config
+    queue = get_ingest_queue()
+    inserted = 0
+    while True:
+        claimed = queue.claim(config.get("INGEST_FLUSH_BATCH_SIZE"))
+        if not claimed:
+            return inserted
+        try:
+            _insert_journaled([payload for _, payload, _ in claimed])
+        except SQLAlchemyError:
+            db.session.rollback()
+            current_app.logger.exception("Ingest batch failed, retrying rows one by one")
+            inserted += _flush_one_by_one(queue, claimed)
+            return inserted
+        queue.ack([id for id, _, _ in claimed])
+        inserted += len(claimed)
+
+
+def _flush_one_by_one(queue, claimed):
+    inserted = 0
+    failed = []
+    for id, payload, attempts in claimed:
+        try:
+            _insert_journaled([payload])
+        except SQLAlchemyError:
+            db.session.rollback()
+            if attempts >= current_app.config.get("INGEST_MAX_ATTEMPTS"):
+                current_app.logger.error(f"Burying task execution {payload}")
+                queue.bury([id])
+            else:
+                failed.append(id)
+            continue
+        queue.ack([id])
+        inserted += 1
+    queue.release(failed)
+    return inserted
+
+
+def _insert_journaled(payloads):
+    rows = [
+        dict(
+            robot_id=payload["robot_id"],
+            task_id=payload["task_id"],
+            start=utc_datetime_from_string(payload["start"]),
+            end=utc_datetime_from_string(payload["end"]) if payload["end"] else None,
+            success=payload["success"],
+        )
+        for payload in payloads
+    ]
+    ids = insert_task_executions(
+        rows, chunk_size=current_app.config.get("BULK_INSERT_CHUNK_SIZE")
+    )
+    TaskExecutionRollup.apply(rows)
+    bump_task_execution_version()
+    ChangeLog.record(TaskExecution.__tablename__, ids)
+    db.session.commit()
+
+
+def _resolve_dimension_id(item, dimension, index):
+    id = item.get(f"{dimension}_id")
+    name = item.get(f"{dimension}_name")
+    if id is not None:
+        try:
+            id = int(id)
+        except (TypeError, ValueError):
+            return f"{dimension}_id must be an integer."
+        if not index.has_id(id):
+            return f"{dimension.capitalize()} with id {id} does not exist"
+        return id
+    if name is not None:
+        resolved = index.id_for_name(name)
+        if resolved is None:
+            return f"{dimension.capitalize()} with name {name} does not exist"
+        return resolved
+    return f"Either {dimension}_id or {dimension}_name is required."
@@ -0,0 +1,154 @@
+"""SQL GROUP BY aggregation of task executions for /task-executions/stats."""
+from sqlalchemy import Float, case, cast, func, literal_column
+
+from src.robot_management import db
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.models.task_execution_rollup import TaskExecutionRollup
+from src.robot_management.util.sql_util import duration_seconds, time_bucket
+from .filters import apply_task_execution_filters
+
+GROUP_BY_CHOICES = ("robot_name", "robot_type", "task_name", "task_type", "status")
+PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+ROLLUP_GROUP_BY_CHOICES = GROUP_BY_CHOICES[:-1]
+ROLLUP_FILTERS = ("robot_name", "robot_type", "task_name", "task_type", "start", "end")
+
+
+def _group_columns():
+    return dict(
+        robot_name=Robot.name,
+        robot_type=Robot.type,
+        task_name=Task.name,
+        task_type=Task.type,
+        status=case([(TaskExecution.success.is_(True), "Success")], else_="Failed"),
+    )
+
+
+def aggregate_task_executions(filter_dict, group_by=None, bucket=None):
+    """Count executions, success ratio and duration statistics per group.
+
+    Percentiles use percentile_cont, which is only available on PostgreSQL;
+    other databases report them as null.
+    """
+    dialect_name = db.engine.dialect.name
+    group_columns = _group_columns()
+    keys, columns = _key_columns(
+        group_columns, group_by, bucket, TaskExecution.start, dialect_name
+    )
+    duration = duration_seconds(dialect_name, TaskExecution.start, TaskExecution.end)
+    success = case([(TaskExecution.success.is_(True), 1)], else_=0)
+    aggregates = [
+        func.count(TaskExecution.id).label("count"),
+        func.sum(success).label("success_count"),
+        func.min(duration).label("min"),
+        func.avg(cast(duration, Float)).label("avg"),
+        func.max(duration).label("max"),
+    ]
+    if dialect_name == "postgresql":
+        aggregates += [
+            func.percentile_cont(fraction).within_group(duration).label(name)
+            for name, fraction in PERCENTILES
+        ]
+    query = db.session.query(*columns, *aggregates).select_from(TaskExecution)
+    query = apply_task_execution_filters(query, filter_dict)
+    query = _group_by_ordinals(query, columns)
+    return [_stats_row(row, keys) for row in query]
+
+
+def aggregate_task_execution_rollups(filter_dict, group_by=None, bucket=None):
+    """Same statistics as aggregate_task_executions, read from the hourly rollups.
+
+    The cost depends on the number of robot/task/hour combinations, not on the
+    number of executions. start/end filters select whole hourly buckets, and
+    status, min/max and percentiles are not available from the counters.
+    """
+    dialect_name = db.engine.dialect.name
+    rollup = TaskExecutionRollup
+    group_columns = dict(
+        robot_name=Robot.name,
+        robot_type=Robot.type,
+        task_name=Task.name,
+        task_type=Task.type,
+    )
+    keys, columns = _key_columns(
+        group_columns, group_by, bucket, rollup.bucket_start, dialect_name
+    )
+    duration_count = func.nullif(func.sum(rollup.duration_count), 0)
+    aggregates = [
+        func.sum(rollup.count).label("count"),
+        func.sum(rollup.success_count).label("success_count"),
+        (func.sum(rollup.duration_sum) / duration_count).label("avg"),
+    ]
+    query = (
+        db.session.query(*columns, *aggregates)
+        .select_from(rollup)
+        .join(Robot, Robot.id == rollup.robot_id)
+        .join(Task, Task.id == rollup.task_id)
+    )
+    predicates = dict(
+        robot_name=lambda v: Robot.name == v,
+        robot_type=lambda v: Robot.type == v,
+        task_name=lambda v: Task.name == v,
+        task_type=lambda v: Task.type == v,
+        start=lambda v: rollup.bucket_start >= _floor_hour(v),
+        end=lambda v: rollup.bucket_start <= v,
+    )
+    for name, value in filter_dict.items():
+        if value is not None and name in predicates:
+            query = query.filter(predicates[name](value))
+    query = _group_by_ordinals(query, columns)
+    return [_stats_row(row, keys) for row in query]
+
+
+def _key_columns(group_columns, group_by, bucket, time_column, dialect_name):
+    keys = []
+    columns = []
+    for name in group_by or []:
+        if name not in keys:
+            keys.append(name)
+            columns.append(group_columns[name].label(name))
+    if bucket:
+        keys.append("bucket")
+        columns.append(time_bucket(dialect_name, bucket, time_column).label("bucket"))
+    return keys, columns
+
+
+def _group_by_ordinals(query, columns):
+    # Group by ordinal: bound parameters (e.g. in CASE or date_trunc) would
+    # otherwise be rendered twice and PostgreSQL would see two expressions.
+    if not columns:
+        return query
+    ordinals = [literal_column(str(i)) for i in range(1, len(columns) + 1)]
+    return query.group_by(*ordinals).order_by(*ordinals)
+
+
+def _stats_row(row, keys):
+    values = row._asdict()
+    stats = {key: _bucket_value(values[key]) for key in keys}
+    count = values["count"]
+    success_count = int(values["success_count"] or 0)
+    stats.update(
+        count=count,
+        success_count=success_count,
+        success_ratio=round(success_count / count, 4) if count else None,
+        duration=dict(
+            min=_seconds(values.get("min")),
+            avg=_seconds(values["avg"]),
+            max=_seconds(values.get("max")),
+            **{name: _seconds(values.get(name)) for name, _ in PERCENTILES},
+        ),
+    )
+    return stats
+
+
+def _floor_hour(dt):
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def _bucket_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _seconds(value):
+    return round(float(value), 3) if value is not None else None
@@ -0,0 +1,143 @@
+"""Server-sent events feed of newly created task executions."""
+import time
+from collections import deque
+
+from flask import current_app
+from sqlalchemy import func
+
+from src.robot_management import db
+from src.robot_management.api.encoders import task_execution_encoder
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.util.broker import Broker
+from src.robot_management.util.serialization import dumps
+from .filters import filter_task_executions
+
+STREAM_FILTERS = ("robot_name", "robot_type", "task_name", "task_type")
+
+
+class ExecutionEvent:
+    """Notice that an execution was committed, used to wake up subscribers."""
+
+    __slots__ = ("id", "attributes")
+
+    def __init__(self, task_execution):
+        self.id = task_execution.id
+        self.attributes = dict(
+            robot_name=task_execution.robot.name,
+            robot_type=task_execution.robot.type,
+            task_name=task_execution.task.name,
+            task_type=task_execution.task.type,
+        )
+
+
+class Watermark:
+    """Highest task execution id seen by the stream at least settle_seconds ago.
+
+    Ids are allocated before commit, so a row can appear after rows with a
+    higher id were already sent. Sending only ids up to the watermark gives
+    such transactions settle_seconds to commit; rows committing later than
+    that are still skipped.
+    """
+
+    def __init__(self, settle_seconds):
+        self.settle_seconds = settle_seconds
+        self.settled = 0
+        self.pending = False
+        self._observed = deque()
+
+    def advance(self):
+        now = time.monotonic()
+        latest = db.session.query(func.max(TaskExecution.id)).scalar() or 0
+        self._observed.append((now, latest))
+        while self._observed and now - self._observed[0][0] >= self.settle_seconds:
+            self.settled = max(self.settled, self._observed.popleft()[1])
+        self.pending = latest > self.settled
+        return self.settled
+
+
+def get_task_execution_broker(app=None):
+    app = app or current_app
+    if "task_execution_broker" not in app.extensions:
+        app.extensions["task_execution_broker"] = Broker(
+            buffer_size=app.config.get("TASK_EXECUTION_STREAM_BUFFER")
+        )
+    return app.extensions["task_execution_broker"]
+
+
+def publish_task_execution(task_execution):
+    """Push a committed execution to the stream subscribers of this process."""
+    broker = get_task_execution_broker()
+    if broker.stats()["subscribers"]:
+        broker.publish(ExecutionEvent(task_execution))
+
+
+def stream_task_executions(filter_dict, last_event_id=None):
+    """Yield SSE messages for executions matching filter_dict, forever.
+
+    Messages are always read from the database by id, so executions are sent
+    in id order. An execution is held back until its id is older than
+    TASK_EXECUTION_STREAM_SETTLE_SECONDS (see Watermark), so one whose
+    transaction commits later than that after a higher id is never sent:
+    delivery is best-effort, and clients needing every row should page
+    /changes instead. The broker only wakes the stream up as soon as this
+    process commits a matching execution; executions created by other worker
+    processes, bulk or async ingest are picked up by the same read at the
+    next wake-up or heartbeat. The database connection is released while the
+    stream waits.
+    """
+    filter_dict = {k: v for k, v in filter_dict.items() if k in STREAM_FILTERS}
+    config = current_app.config
+    heartbeat = config.get("TASK_EXECUTION_STREAM_HEARTBEAT")
+    settle = config.get("TASK_EXECUTION_STREAM_SETTLE_SECONDS")
+    broker = get_task_execution_broker()
+    watermark = Watermark(settle)
+    if last_event_id is None:
+        last_event_id = db.session.query(func.max(TaskExecution.id)).scalar() or 0
+        db.session.remove()
+    yield f"retry: {config.get('TASK_EXECUTION_STREAM_RETRY_MS')}\n\n".encode("utf-8")
+    while True:
+        with broker.subscribe(_event_predicate(filter_dict)) as subscription:
+            while True:
+                for message, last_event_id in _read_after(
+                    filter_dict, last_event_id, watermark
+                ):
+                    yield message
+                if subscription.overflowed:
+                    break
+                if watermark.pending:
+                    subscription.get(timeout=settle)
+                elif not subscription.get(timeout=heartbeat):
+                    yield b": keep-alive\n\n"
+
+
+def _read_after(filter_dict, last_event_id, watermark):
+    chunk_size = current_app.config.get("TASK_EXECUTION_STREAM_CHUNK_SIZE")
+    try:
+        settled = watermark.advance()
+        while True:
+            chunk = (
+                filter_task_executions(filter_dict)
+                .filter(TaskExecution.id > last_event_id, TaskExecution.id <= settled)
+                .order_by(TaskExecution.id)
+                .limit(chunk_size)
+                .all()
+            )
+            for task_execution in chunk:
+                last_event_id = task_execution.id
+                yield _format_event(task_execution), last_event_id
+            if len(chunk) < chunk_size:
+                return
+    finally:
+        db.session.remove()
+
+
+def _event_predicate(filter_dict):
+    wanted = {k: v for k, v in filter_dict.items() if v is not None}
+    if not wanted:
+        return None
+    return lambda event: all(event.attributes[k] == v for k, v in wanted.items())
+
+
+def _format_event(task_execution):
+    data = dumps(task_execution_encoder(task_execution))
+    return b"id: %d\nevent: task_execution\ndata: %s\n\n" % (task_execution.id, data)
@@ -5,12 +5,17 @@ from flask import jsonify, url_for, current_app
 from flask_restx import abort
 
 from src.robot_management import db
+from src.robot_management.api.encoders import task_encoder, task_list_encoder
 from src.robot_management.api.auth.decorators import (
     token_required,
     admin_token_required,
 )
 from src.robot_management.api.parsers import parse_name
-from src.robot_management.models.task import Task
+from src.robot_management.models.task import Task, task_index
+from src.robot_management.models.change_log import ChangeLog
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.util.conditional import conditional_response
+from src.robot_management.util.serialization import json_response
 
 
 @admin_token_required
@@ -23,7 +28,11 @@ def create_task(task_dict):
         abort(HTTPStatus.CONFLICT, error, status="fail")
     task = Task(**task_dict)
     db.session.add(task)
+    db.session.flush()
+    TableVersion.bump(Task.__tablename__)
+    ChangeLog.record(Task.__tablename__, [task.id])
     db.session.commit()
+    task_index.invalidate()
     response = jsonify(status="success", message=f"New task added: {name}.")
     current_app.logger.info(f"Added task: {task}")
     response.status_code = HTTPStatus.CREATED
@@ -34,16 +43,22 @@ def create_task(task_dict):
 @token_required
 def retrieve_task_list():
     current_app.logger.info("Task list requested")
-    tasks = Task.query.all()
-    response = jsonify(tasks)
-    return response
+    version, updated_at = TableVersion.get(Task.__tablename__)
+    return conditional_response(
+        Task.__tablename__,
+        version,
+        updated_at,
+        lambda: json_response(task_list_encoder.many(Task.query.all())),
+        cache_control="private, no-cache",
+    )
 
 @token_required
 def retrieve_task(name):
     current_app.logger.info(f"Task {name} requested")
-    return Task.query.filter_by(name=name.lower()).first_or_404(
+    task = Task.query.filter_by(name=name.lower()).first_or_404(
         description=f"{name} not found."
     )
+    return json_response(task_encoder(task))
 
 @token_required
 def update_task(name, task_dict):
@@ -51,7 +66,10 @@ def update_task(name, task_dict):
     if task:
         for k, v in task_dict.items():
             setattr(task, k, v)
+        TableVersion.bump(Task.__tablename__)
+        ChangeLog.record(Task.__tablename__, [task.id])
         db.session.commit()
+        task_index.invalidate()
         message = f"'{name}' was successfully updated"
         current_app.logger.info(message)
         response_dict = dict(status="success", message=message)
@@ -70,6 +88,9 @@ def delete_task(name):
         description=f"{name} not found in database."
     )
     db.session.delete(task)
+    TableVersion.bump(Task.__tablename__)
+    ChangeLog.record(Task.__tablename__, [task.id], deleted=True)
     db.session.commit()
+    task_index.invalidate()
     current_app.logger.info(f"Task {name} deleted")
     return "", HTTPStatus.NO_CONTENT
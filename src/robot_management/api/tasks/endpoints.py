@@ -54,7 +54,6 @@ class Task(Resource):
 
     @task_ns.doc(security="Bearer")
     @task_ns.response(int(HTTPStatus.OK), "Retrieved task.", task_model)
-    @task_ns.marshal_with(task_model)
     def get(self, name):
         """Retrieve a task."""
         return retrieve_task(name)
@@ -1,6 +1,8 @@
 """Config settings for for development, testing and production environments."""
 import os
 
+from .util.db_pool import InstrumentedQueuePool
+
 
 class Config:
     """Base configuration."""
@@ -17,12 +19,100 @@ class Config:
     DEBUG = False
     TESTING = False
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
+    BLACKLIST_SYNC_SECONDS = int(os.getenv("BLACKLIST_SYNC_SECONDS", 5))
+    REVOCATION_FILTER_DIR = os.getenv("REVOCATION_FILTER_DIR")
+    REVOCATION_FILTER_CAPACITY = 100000
+    REVOCATION_FILTER_ERROR_RATE = 0.001
+    REVOCATION_BUCKET_SECONDS = 3600
+    TOKEN_PURGE_INTERVAL = int(os.getenv("TOKEN_PURGE_INTERVAL", 0))
+    TOKEN_PURGE_BATCH_SIZE = 1000
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 32))
+    LOGIN_FAILURE_WINDOW_SECONDS = 300
+    LOGIN_MAX_FAILURES_PER_EMAIL = int(os.getenv("LOGIN_MAX_FAILURES_PER_EMAIL", 5))
+    LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", 50))
+    DIMENSION_CACHE_TTL = int(os.getenv("DIMENSION_CACHE_TTL", 60))
+    DIMENSION_MISS_RELOAD_SECONDS = 1
+    TASK_EXECUTION_PAGE_SIZE = 100
+    TASK_EXECUTION_MAX_PAGE_SIZE = int(os.getenv("TASK_EXECUTION_MAX_PAGE_SIZE", 1000))
+    BULK_INGEST_MAX_ITEMS = int(os.getenv("BULK_INGEST_MAX_ITEMS", 50000))
+    BULK_INSERT_CHUNK_SIZE = 1000
+    EXPORT_CHUNK_ROWS = 1000
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson")
+    COMPRESS_MIMETYPES = ["application/json", "application/x-ndjson", "text/csv"]
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 4
+    COMPRESS_CACHE_SIZE = 256
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 30))
+    RESPONSE_CACHE_SIZE = 1024
+    RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")
+    REPLICA_DATABASE_URLS = [
+        url for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",") if url
+    ]
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+    REPLICA_LAG_CHECK_SECONDS = 5
+    READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", 10))
+    TASK_EXECUTION_ASYNC_INGEST = (
+        os.getenv("TASK_EXECUTION_ASYNC_INGEST", "false").lower() == "true"
+    )
+    # Relative paths are resolved against the app instance folder, so every
+    # worker process uses the same journal whatever its working directory.
+    INGEST_QUEUE_PATH = os.getenv("INGEST_QUEUE_PATH", "ingest_queue.sqlite")
+    INGEST_FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", 1))
+    INGEST_FLUSH_BATCH_SIZE = 1000
+    INGEST_LEASE_SECONDS = 60
+    INGEST_MAX_ATTEMPTS = 5
+    TASK_EXECUTION_STREAM_BUFFER = 100
+    TASK_EXECUTION_STREAM_HEARTBEAT = 15
+    TASK_EXECUTION_STREAM_RETRY_MS = 3000
+    TASK_EXECUTION_STREAM_CHUNK_SIZE = 500
+    TASK_EXECUTION_STREAM_SETTLE_SECONDS = 2
+    INSTRUMENTATION_ENABLED = (
+        os.getenv("INSTRUMENTATION_ENABLED", "true").lower() == "true"
+    )
+    INSTRUMENTATION_LOG = True
+    # Concurrent task execution writers lock one of these version rows each.
+    TASK_EXECUTION_VERSION_SHARDS = 16
+    # Changes become visible this long after being recorded, by which time
+    # their transaction has committed even if it got a lower seq than others.
+    CHANGES_SETTLE_SECONDS = 5
+    CHANGES_PAGE_SIZE = 500
+    CHANGES_MAX_PAGE_SIZE = 5000
+    IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 86400))
+    IDEMPOTENCY_LEASE_SECONDS = 60
+    IDEMPOTENCY_STORE_SIZE = 100000
+    # Relative to the app instance folder, like INGEST_QUEUE_PATH.
+    IDEMPOTENCY_STORE_PATH = os.getenv(
+        "IDEMPOTENCY_STORE_PATH", "idempotency_keys.sqlite"
+    )
+    # Size pools so workers * (pool_size + max_overflow) stays under the
+    # server's max_connections; GET /api/diagnostics/pool shows live usage.
+    SQLALCHEMY_ENGINE_OPTIONS = dict(
+        poolclass=InstrumentedQueuePool,
+        pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 5)),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 10)),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        pool_pre_ping=True,
+    )
+    if (SQLALCHEMY_DATABASE_URI or "").startswith("postgres"):
+        # libpq connection option; other drivers reject unknown arguments.
+        SQLALCHEMY_ENGINE_OPTIONS["connect_args"] = dict(
+            options=f"-c statement_timeout={os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000)}"
+        )
 
 
 class TestingConfig(Config):
     """Testing configuration."""
 
     TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.getenv("TEST_DATABASE_URL", "sqlite://")
+    if SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+    IDEMPOTENCY_STORE_PATH = None
+    CHANGES_SETTLE_SECONDS = 0
+    TASK_EXECUTION_STREAM_SETTLE_SECONDS = 0
 
 
 class DevelopmentConfig(Config):
@@ -31,6 +121,9 @@ class DevelopmentConfig(Config):
     DEVELOPMENT = True
     DEBUG = True
     TOKEN_EXPIRE_MINUTES = 15
+    SQLALCHEMY_ENGINE_OPTIONS = dict(
+        Config.SQLALCHEMY_ENGINE_OPTIONS, pool_size=int(os.getenv("DB_POOL_SIZE", 2))
+    )
 
 
 class ProductionConfig(Config):
@@ -40,6 +133,11 @@ class ProductionConfig(Config):
     BCRYPT_LOG_ROUNDS = 13
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     PRESERVE_CONTEXT_ON_EXCEPTION = True
+    SQLALCHEMY_ENGINE_OPTIONS = dict(
+        Config.SQLALCHEMY_ENGINE_OPTIONS,
+        pool_size=int(os.getenv("DB_POOL_SIZE", 10)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+    )
     DEBUG = False
 
 
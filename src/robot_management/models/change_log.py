@@ -0,0 +1,132 @@
+"""Class definition for ChangeLog."""
+from datetime import timedelta
+
+from src.robot_management import db
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.util.datetime_util import utc_now
+
+
+class ChangeLog(db.Model):
+    """One row per created, updated or deleted robot, task or task execution.
+
+    seq is an autoincrement column, so recording a change takes no lock
+    shared with other writers. Transactions may therefore commit out of seq
+    order; readers only see changes older than a settle window (see since()
+    and latest()), so a client that has read up to seq does not miss a
+    smaller one still in flight. This is best-effort: changed_at is the
+    application clock at record() time, so a transaction that commits more
+    than the settle window after record() (lock waits, a stalled worker) can
+    land below a seq already handed out as a cursor, and clients that have
+    moved past it never see that change. Deletes are kept as tombstones
+    (deleted=True).
+
+    purge() removes old rows and raises the "change_log_purged" floor;
+    clients asking for changes below the floor must re-fetch everything.
+    """
+
+    __tablename__ = "change_log"
+
+    FLOOR = "change_log_purged"
+
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entity = db.Column(db.String(32), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted = db.Column(db.Boolean, nullable=False, default=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=utc_now, index=True)
+
+    def __repr__(self):
+        return (
+            f"<ChangeLog seq={self.seq}, entity={self.entity}, "
+            f"entity_id={self.entity_id}, deleted={self.deleted}>"
+        )
+
+    @classmethod
+    def record(cls, entity, ids, deleted=False):
+        """Append one change per id of table entity; the caller commits.
+
+        Call it last before committing (after flushing the rows, so new ids
+        are known) to keep the time between changed_at and commit short.
+        """
+        if not ids:
+            return
+        now = utc_now().replace(tzinfo=None)
+        db.session.execute(
+            cls.__table__.insert(),
+            [
+                dict(entity=entity, entity_id=id, deleted=deleted, changed_at=now)
+                for id in ids
+            ],
+        )
+
+    @classmethod
+    def since(cls, seq, limit, settle_seconds=0):
+        """Return up to limit settled changes after seq, oldest first.
+
+        Changes recorded less than settle_seconds ago are held back, along
+        with every higher seq, until they settle (see the class docstring).
+        """
+        return (
+            cls.query.filter(cls.seq > seq, cls._settled(settle_seconds))
+            .order_by(cls.seq)
+            .limit(limit)
+            .all()
+        )
+
+    @classmethod
+    def latest(cls, settle_seconds=0):
+        """Return the seq of the most recent settled change (the floor if none)."""
+        seq = (
+            db.session.query(cls.seq)
+            .filter(cls._settled(settle_seconds))
+            .order_by(cls.seq.desc())
+            .limit(1)
+            .scalar()
+        )
+        return max(seq or 0, cls.floor())
+
+    @classmethod
+    def floor(cls):
+        """Return the highest purged seq; changes at or below it are gone."""
+        return TableVersion.get(cls.FLOOR)[0]
+
+    @classmethod
+    def purge(cls, days, batch_size=1000):
+        """Delete changes older than days days, returning the rows deleted."""
+        cutoff = utc_now().replace(tzinfo=None) - timedelta(days=days)
+        last = (
+            db.session.query(db.func.max(cls.seq))
+            .filter(cls.changed_at < cutoff)
+            .scalar()
+        )
+        if last is None:
+            return 0
+        floor = cls.floor()
+        if last > floor:
+            TableVersion.bump(cls.FLOOR, count=last - floor)
+        db.session.commit()
+        rows = 0
+        while True:
+            expired = (
+                db.session.query(cls.seq)
+                .filter(cls.seq <= last)
+                .limit(batch_size)
+                .subquery()
+            )
+            deleted = cls.query.filter(cls.seq.in_(expired)).delete(
+                synchronize_session=False
+            )
+            db.session.commit()
+            rows += deleted
+            if deleted < batch_size:
+                return rows
+
+    @classmethod
+    def _settled(cls, settle_seconds):
+        """Filter for changes below the oldest one recorded within the window."""
+        cutoff = utc_now().replace(tzinfo=None) - timedelta(seconds=settle_seconds)
+        unsettled = (
+            db.session.query(db.func.min(cls.seq))
+            .filter(cls.changed_at > cutoff)
+            .as_scalar()
+        )
+        return db.or_(unsettled.is_(None), cls.seq < unsettled)
@@ -1,4 +1,5 @@
 from src.robot_management import db
+from src.robot_management.util.dimension_index import DimensionIndex
 from dataclasses import dataclass
 
 
@@ -14,7 +15,7 @@ class Robot(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
-    type = db.Column(db.String(100))
+    type = db.Column(db.String(100), index=True)
 
     def __repr__(self) -> str:
         return f"<Robot name={self.name}, type={self.type}>"
@@ -29,3 +30,6 @@ class Robot(db.Model):
     @classmethod
     def find_by_type(cls, type):
         return cls.query.filter_by(type=type).all()
+
+
+robot_index = DimensionIndex(Robot)
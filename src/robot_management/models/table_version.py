@@ -0,0 +1,88 @@
+"""Class definition for TableVersion."""
+import random
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.robot_management import db
+from src.robot_management.util.datetime_util import utc_now
+
+
+class TableVersion(db.Model):
+    """Change counter per table, used as the validator for conditional GETs.
+
+    Business functions call bump() in the same transaction as every insert,
+    update or delete of the table, so all worker processes agree on the
+    version, and reading it is a single indexed lookup.
+
+    A bump locks its counter row until the transaction commits. Tables with
+    concurrent writers (task executions) spread their counter over several
+    shard rows, and a bump locks one of them at random; the version is the
+    sum of the shards, which grows with every commit whatever their order.
+    """
+
+    __tablename__ = "table_version"
+
+    name = db.Column(db.String(64), primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True, autoincrement=False, default=0)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utc_now)
+
+    def __repr__(self):
+        return (
+            f"<TableVersion name={self.name}, shard={self.shard}, "
+            f"version={self.version}>"
+        )
+
+    @classmethod
+    def bump(cls, name, count=1, shards=1):
+        """Increment the version of table name by count; the caller commits."""
+        table = cls.__table__
+        shard = random.randrange(shards) if shards > 1 else 0
+        now = utc_now().replace(tzinfo=None)
+        if db.engine.dialect.name == "postgresql":
+            statement = pg_insert(table).values(
+                name=name, shard=shard, version=count, updated_at=now
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=["name", "shard"],
+                set_=dict(version=table.c.version + count, updated_at=now),
+            )
+            db.session.execute(statement)
+            return
+        # Elsewhere (SQLite serializes writers) update first, insert if missing.
+        result = db.session.execute(
+            table.update()
+            .where((table.c.name == name) & (table.c.shard == shard))
+            .values(version=table.c.version + count, updated_at=now)
+        )
+        if not result.rowcount:
+            db.session.execute(
+                table.insert().values(
+                    name=name, shard=shard, version=count, updated_at=now
+                )
+            )
+
+    @classmethod
+    def get(cls, name):
+        """Return (version, updated_at) of table name, (0, None) if never bumped."""
+        table = cls.__table__
+        row = db.session.execute(
+            db.select([func.sum(table.c.version), func.max(table.c.updated_at)]).where(
+                table.c.name == name
+            )
+        ).first()
+        return (int(row[0]), row[1]) if row[0] is not None else (0, None)
+
+    @classmethod
+    def get_many(cls, names):
+        """Return {name: version} for names in one query, 0 if never bumped."""
+        table = cls.__table__
+        rows = db.session.execute(
+            db.select([table.c.name, func.sum(table.c.version)])
+            .where(table.c.name.in_(names))
+            .group_by(table.c.name)
+        )
+        versions = dict.fromkeys(names, 0)
+        versions.update((name, int(version)) for name, version in rows)
+        return versions
@@ -1,4 +1,5 @@
 from src.robot_management import db
+from src.robot_management.util.dimension_index import DimensionIndex
 from dataclasses import dataclass
 
 
@@ -13,7 +14,7 @@ class Task(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
-    type = db.Column(db.String(100))
+    type = db.Column(db.String(100), index=True)
 
     def __repr__(self) -> str:
         return f"<Task name={self.name}, type={self.type}>"
@@ -28,3 +29,6 @@ class Task(db.Model):
     @classmethod
     def find_by_type(cls, type):
         return cls.query.filter_by(type=type).all()
+
+
+task_index = DimensionIndex(Task)
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from src.robot_management.models.robot import Robot
 from src.robot_management import db
 from src.robot_management.util.datetime_util import format_timedelta_str, utc_now
@@ -18,6 +18,13 @@ class TaskExecution(db.Model):
     success: bool
 
     __tablename__ = "task_execution"
+    __table_args__ = (
+        db.Index("ix_task_execution_start_id", "start", "id"),
+        db.Index("ix_task_execution_robot_id_start_id", "robot_id", "start", "id"),
+        db.Index("ix_task_execution_task_id_start_id", "task_id", "start", "id"),
+        db.Index("ix_task_execution_success_start_id", "success", "start", "id"),
+        db.Index("ix_task_execution_end", "end"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     robot_id = db.Column(db.Integer, db.ForeignKey("robot.id"), nullable=False)
@@ -30,7 +37,9 @@ class TaskExecution(db.Model):
 
     @property
     def duration(self):
-        return self.end.replace(tzinfo=timezone.utc) - utc_now()
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
 
     @property
     def robot_name(self):
@@ -54,5 +63,5 @@ class TaskExecution(db.Model):
 
     @hybrid_property
     def duration_str(self):
-        timedelta_str = format_timedelta_str(self.duration)
-        return timedelta_str
+        duration = self.duration
+        return format_timedelta_str(duration) if duration is not None else None
@@ -0,0 +1,168 @@
+"""Class definition for TaskExecutionRollup."""
+from collections import defaultdict
+from datetime import timezone
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.robot_management import db
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.util.sql_util import duration_seconds, time_bucket
+
+
+class TaskExecutionRollup(db.Model):
+    """Pre-aggregated task execution counters per robot, task and hour.
+
+    Rows are derived data: they are updated in the same transaction as the
+    executions they summarize and can be rebuilt with `flask rebuild-rollups`.
+    robot_id/task_id deliberately have no foreign keys so that rollups never
+    block deleting a robot or task.
+    """
+
+    __tablename__ = "task_execution_rollup"
+
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    robot_id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, primary_key=True, index=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    success_count = db.Column(db.Integer, nullable=False, default=0)
+    duration_count = db.Column(db.Integer, nullable=False, default=0)
+    duration_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        db.Index(
+            "ix_task_execution_rollup_robot_id_bucket", "robot_id", "bucket_start"
+        ),
+    )
+
+    COUNTERS = ("count", "success_count", "duration_count", "duration_sum")
+
+    def __repr__(self):
+        return (
+            f"<TaskExecutionRollup bucket_start={self.bucket_start}, "
+            f"robot_id={self.robot_id}, task_id={self.task_id}, count={self.count}>"
+        )
+
+    @classmethod
+    def apply(cls, executions, sign=1):
+        """Add (sign=1) or remove (sign=-1) executions from the rollup counters.
+
+        executions is an iterable of dicts or objects with robot_id, task_id,
+        start, end and success. Executions without a start are not counted,
+        as in rebuild(). Must be called inside the transaction that inserts or
+        deletes those executions; the caller commits.
+        """
+        deltas = defaultdict(lambda: dict.fromkeys(cls.COUNTERS, 0))
+        for execution in executions:
+            if not isinstance(execution, dict):
+                execution = {name: getattr(execution, name) for name in _FIELDS}
+            start = _naive_utc(execution["start"])
+            if start is None:
+                continue
+            end = _naive_utc(execution["end"])
+            key = (_hour(start), execution["robot_id"], execution["task_id"])
+            delta = deltas[key]
+            delta["count"] += sign
+            delta["success_count"] += sign if execution["success"] else 0
+            if end is not None:
+                delta["duration_count"] += sign
+                delta["duration_sum"] += sign * (end - start).total_seconds()
+        if not deltas:
+            return
+        rows = [
+            dict(bucket_start=k[0], robot_id=k[1], task_id=k[2], **delta)
+            for k, delta in deltas.items()
+        ]
+        if db.engine.dialect.name == "postgresql":
+            cls._upsert_postgresql(rows)
+        else:
+            cls._upsert_generic(rows)
+        if sign < 0:
+            touched = db.or_(
+                *(
+                    (cls.bucket_start == row["bucket_start"])
+                    & (cls.robot_id == row["robot_id"])
+                    & (cls.task_id == row["task_id"])
+                    for row in rows
+                )
+            )
+            cls.query.filter(touched, cls.count <= 0).delete(synchronize_session=False)
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every rollup row from task_execution with INSERT .. SELECT.
+
+        Bumps the task_execution version so cached stats are not served from
+        the old rows; the caller commits.
+        """
+        dialect_name = db.engine.dialect.name
+        start, end = TaskExecution.start, TaskExecution.end
+        bucket = time_bucket(dialect_name, "hour", start, isoformat=False)
+        duration = duration_seconds(dialect_name, start, end)
+        success = db.case([(TaskExecution.success.is_(True), 1)], else_=0)
+        select = (
+            db.select(
+                [
+                    bucket,
+                    TaskExecution.robot_id,
+                    TaskExecution.task_id,
+                    func.count(TaskExecution.id),
+                    func.sum(success),
+                    func.count(TaskExecution.end),
+                    func.coalesce(func.sum(duration), 0.0),
+                ]
+            )
+            .where(TaskExecution.start.isnot(None))
+            .group_by(
+                literal_column("1"), TaskExecution.robot_id, TaskExecution.task_id
+            )
+        )
+        table = cls.__table__
+        db.session.execute(table.delete())
+        result = db.session.execute(
+            table.insert().from_select(
+                ["bucket_start", "robot_id", "task_id", *cls.COUNTERS], select
+            )
+        )
+        TableVersion.bump(TaskExecution.__tablename__)
+        return result.rowcount
+
+    @classmethod
+    def _upsert_postgresql(cls, rows):
+        statement = pg_insert(cls.__table__).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=["bucket_start", "robot_id", "task_id"],
+            set_={
+                name: getattr(cls.__table__.c, name) + getattr(statement.excluded, name)
+                for name in cls.COUNTERS
+            },
+        )
+        db.session.execute(statement)
+
+    @classmethod
+    def _upsert_generic(cls, rows):
+        table = cls.__table__
+        for row in rows:
+            key = (
+                (table.c.bucket_start == row["bucket_start"])
+                & (table.c.robot_id == row["robot_id"])
+                & (table.c.task_id == row["task_id"])
+            )
+            values = {name: getattr(table.c, name) + row[name] for name in cls.COUNTERS}
+            result = db.session.execute(table.update().where(key).values(**values))
+            if not result.rowcount:
+                db.session.execute(table.insert().values(**row))
+
+
+_FIELDS = ("robot_id", "task_id", "start", "end", "success")
+
+
+def _naive_utc(dt):
+    if dt is not None and dt.tzinfo:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _hour(dt):
+    return dt.replace(minute=0, second=0, microsecond=0)
@@ -1,28 +1,236 @@
 """Class definition for BlacklistedToken."""
-from datetime import timezone
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.robot_management import db
 from src.robot_management.util.datetime_util import utc_now, dtaware_fromtimestamp
+from src.robot_management.util.revocation import RevocationFilter
+from src.robot_management.util.ttl_cache import TTLCache
+
+
+def token_key(token):
+    """Compact digest of an access token, used as an in-memory lookup key."""
+    return hashlib.blake2b(token.encode("ascii"), digest_size=16).digest()
 
 
 class BlacklistedToken(db.Model):
-    """BlacklistedToken Model for storing JWT tokens."""
+    """BlacklistedToken Model for storing revoked JWT ids.
+
+    The table is the authoritative store. Each process answers "not revoked"
+    from a RevocationFilter (Bloom filters, optionally shared between workers
+    through REVOCATION_FILTER_DIR) and only queries the table when the filter
+    reports a possible hit. Rows added by other hosts are merged into the
+    filter incrementally (ids above the last one seen, re-reading a small
+    overlap in case ids commit out of order) at most every
+    BLACKLIST_SYNC_SECONDS.
+
+    Rows are useless once expires_at has passed; purge_expired() removes them.
+    On PostgreSQL the table is range-partitioned by expires_at into daily
+    partitions (migration e4a81b6c3d57), so whole expired days are dropped
+    instead of deleted row by row.
+    """
 
     __tablename__ = "token_blacklist"
+    __read_from_primary__ = True
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    token = db.Column(db.String(500), unique=True, nullable=False)
+    jti = db.Column(db.String(64), unique=True, nullable=False)
     blacklisted_on = db.Column(db.DateTime, default=utc_now)
     expires_at = db.Column(db.DateTime, nullable=False)
 
-    def __init__(self, token, expires_at):
-        self.token = token
+    SYNC_OVERLAP = 100
+    _filter = None
+    _confirmed = TTLCache(maxsize=10000)
+    _last_id = 0
+    _synced_at = None
+    _lock = threading.Lock()
+
+    def __init__(self, jti, expires_at):
+        self.jti = jti
         self.expires_at = dtaware_fromtimestamp(expires_at, use_tz=timezone.utc)
 
     def __repr__(self):
-        return f"<BlacklistToken token={self.token}>"
+        return f"<BlacklistToken jti={self.jti}>"
+
+    @classmethod
+    def check_blacklist(cls, jti, expires_at):
+        cls._sync()
+        if not cls._get_filter().might_contain(jti, expires_at):
+            return False
+        if cls._confirmed.get(jti):
+            return True
+        exists = db.session.query(cls.id).filter_by(jti=jti).first() is not None
+        if exists:
+            cls._confirmed.set(jti, True, expires_at=expires_at)
+        return exists
+
+    @classmethod
+    def remember(cls, jti, expires_at):
+        """Record a token blacklisted by this process without waiting for a sync."""
+        cls._get_filter().add(jti, expires_at)
+        cls._confirmed.set(jti, True, expires_at=expires_at)
+
+    @classmethod
+    def reset_cache(cls):
+        with cls._lock:
+            if cls._filter is not None:
+                cls._filter.close()
+            cls._filter = None
+            cls._confirmed.clear()
+            cls._last_id = 0
+            cls._synced_at = None
+
+    @classmethod
+    def purge_expired(cls, batch_size=1000, days_ahead=7):
+        """Remove expired rows, returning (rows deleted, partitions dropped).
+
+        Partitions are also created days_ahead days in advance so that new
+        rows rarely land in the default partition, even if purging does not
+        run for a few days.
+        """
+        partitions = 0
+        if cls._is_partitioned():
+            partitions = cls._drop_expired_partitions()
+            cls.ensure_partitions(days_ahead)
+        rows = 0
+        while True:
+            expired = (
+                db.session.query(cls.id)
+                .filter(cls.expires_at <= utc_now())
+                .limit(batch_size)
+                .subquery()
+            )
+            deleted = cls.query.filter(cls.id.in_(expired)).delete(
+                synchronize_session=False
+            )
+            db.session.commit()
+            rows += deleted
+            if deleted < batch_size:
+                return rows, partitions
+
+    @classmethod
+    def ensure_partitions(cls, days_ahead=7):
+        """Create the daily partitions from today up to days_ahead days ahead.
+
+        Rows of a day without a partition sit in the default partition, and
+        PostgreSQL refuses to create a partition overlapping them. So each
+        missing partition is built as a plain table, the day's rows are moved
+        out of the default partition into it, and it is then attached. A day
+        that still fails is logged and skipped rather than aborting the purge.
+        """
+        today = utc_now().date()
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            name = cls._partition_name(day)
+            exists = db.session.execute(
+                "SELECT to_regclass(:name) IS NOT NULL", dict(name=name)
+            ).scalar()
+            if exists:
+                continue
+            try:
+                cls._create_partition(name, day)
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                current_app.logger.exception(f"Could not create partition {name}")
+
+    @classmethod
+    def _create_partition(cls, name, day):
+        table = cls.__tablename__
+        bounds = dict(lower=day, upper=day + timedelta(days=1))
+        db.session.execute(
+            f"CREATE TABLE {name} "
+            f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        db.session.execute(
+            f"WITH moved AS (DELETE FROM {table}_default "
+            "WHERE expires_at >= :lower AND expires_at < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved",
+            bounds,
+        )
+        db.session.execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['lower'].isoformat()}') "
+            f"TO ('{bounds['upper'].isoformat()}')"
+        )
+
+    @classmethod
+    def _is_partitioned(cls):
+        if db.engine.dialect.name != "postgresql":
+            return False
+        statement = (
+            "SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(:table_name)"
+        )
+        params = dict(table_name=cls.__tablename__)
+        return db.session.execute(statement, params).first() is not None
+
+    @classmethod
+    def _drop_expired_partitions(cls):
+        statement = (
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table_name)"
+        )
+        params = dict(table_name=cls.__tablename__)
+        names = [name for (name,) in db.session.execute(statement, params)]
+        today = utc_now().date()
+        prefix = f"{cls.__tablename__}_p"
+        dropped = 0
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            try:
+                day = datetime.strptime(name[len(prefix) :], "%Y%m%d").date()
+            except ValueError:
+                continue
+            if day < today:
+                db.session.execute(f"DROP TABLE IF EXISTS {name}")
+                dropped += 1
+        db.session.commit()
+        return dropped
+
+    @classmethod
+    def _partition_name(cls, day):
+        return f"{cls.__tablename__}_p{day.strftime('%Y%m%d')}"
+
+    @classmethod
+    def _get_filter(cls):
+        if cls._filter is None:
+            with cls._lock:
+                if cls._filter is None:
+                    config = current_app.config
+                    cls._filter = RevocationFilter(
+                        capacity=config.get("REVOCATION_FILTER_CAPACITY"),
+                        error_rate=config.get("REVOCATION_FILTER_ERROR_RATE"),
+                        bucket_seconds=config.get("REVOCATION_BUCKET_SECONDS"),
+                        directory=config.get("REVOCATION_FILTER_DIR"),
+                    )
+        return cls._filter
 
     @classmethod
-    def check_blacklist(cls, token):
-        exists = cls.query.filter_by(token=token).first()
-        return True if exists else False
+    def _sync(cls):
+        interval = current_app.config.get("BLACKLIST_SYNC_SECONDS")
+        synced_at = cls._synced_at
+        if synced_at is not None and time.monotonic() - synced_at < interval:
+            return
+        revocations = cls._get_filter()
+        with cls._lock:
+            rows = (
+                db.session.query(cls.id, cls.jti, cls.expires_at)
+                .filter(cls.id > cls._last_id - cls.SYNC_OVERLAP)
+                .filter(cls.expires_at > utc_now())
+                .order_by(cls.id)
+                .all()
+            )
+            for id, jti, expires_at in rows:
+                expires_at = expires_at.replace(tzinfo=timezone.utc).timestamp()
+                revocations.add(jti, expires_at)
+                cls._last_id = max(cls._last_id, id)
+            revocations.prune()
+            cls._synced_at = time.monotonic()
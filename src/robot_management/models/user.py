@@ -1,4 +1,5 @@
 """Class definition for User model."""
+import threading
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 
@@ -6,7 +7,7 @@ from flask import current_app
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from src.robot_management import db, bcrypt
-from src.robot_management.models.token_blacklist import BlacklistedToken
+from src.robot_management.models.token_blacklist import BlacklistedToken, token_key
 from src.robot_management.util.datetime_util import (
     utc_now,
     get_local_utcoffset,
@@ -16,6 +17,26 @@ from src.robot_management.util.datetime_util import (
 
 import jwt
 from src.robot_management.util.result import Result
+from src.robot_management.util.ttl_cache import TTLCache
+from src.robot_management.util.worker_pool import BoundedWorkerPool
+
+_decoded_tokens = TTLCache(maxsize=10000)
+_hashing_pool = None
+_hashing_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """Process-wide pool that runs every bcrypt hash and verification."""
+    global _hashing_pool
+    if _hashing_pool is None:
+        with _hashing_pool_lock:
+            if _hashing_pool is None:
+                _hashing_pool = BoundedWorkerPool(
+                    max_workers=current_app.config.get("PASSWORD_HASH_WORKERS"),
+                    queue_size=current_app.config.get("PASSWORD_HASH_QUEUE_SIZE"),
+                    name="bcrypt",
+                )
+    return _hashing_pool
 
 
 class User(db.Model):
@@ -49,11 +70,30 @@ class User(db.Model):
     @password.setter
     def password(self, password):
         log_rounds = current_app.config.get("BCRYPT_LOG_ROUNDS")
-        hash_bytes = bcrypt.generate_password_hash(password, log_rounds)
+        hash_bytes = get_hashing_pool().run(
+            bcrypt.generate_password_hash, password, log_rounds
+        )
         self.password_hash = hash_bytes.decode("utf-8")
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        """Verify password, rehashing it if it was stored with another cost.
+
+        A rehash only changes password_hash; the caller commits.
+        """
+        matches = get_hashing_pool().run(
+            bcrypt.check_password_hash, self.password_hash, password
+        )
+        if matches and self.password_cost != current_app.config["BCRYPT_LOG_ROUNDS"]:
+            self.password = password
+        return matches
+
+    @property
+    def password_cost(self):
+        """bcrypt cost factor of the stored hash ($2b$<cost>$...)."""
+        try:
+            return int(self.password_hash.split("$")[2])
+        except (IndexError, ValueError):
+            return None
 
     @classmethod
     def find_by_email(cls, email):
@@ -70,7 +110,9 @@ class User(db.Model):
         expire = now + timedelta(hours=token_age_h, minutes=token_age_m)
         if current_app.config["TESTING"]:
             expire = now + timedelta(seconds=5)
-        payload = dict(exp=expire, iat=now, sub=self.public_id, admin=self.admin)
+        payload = dict(
+            exp=expire, iat=now, sub=self.public_id, admin=self.admin, jti=uuid4().hex
+        )
         key = current_app.config.get("SECRET_KEY")
         return jwt.encode(payload, key, algorithm="HS256")
 
@@ -81,22 +123,33 @@ class User(db.Model):
         if access_token.startswith("Bearer "):
             split = access_token.split("Bearer")
             access_token = split[1].strip()
-        try:
-            key = current_app.config.get("SECRET_KEY")
-            payload = jwt.decode(access_token, key, algorithms=["HS256"])
-        except jwt.ExpiredSignatureError:
-            error = "Access token expired. Please log in again."
-            return Result.Fail(error)
-        except jwt.InvalidTokenError:
-            error = "Invalid token. Please log in again."
-            return Result.Fail(error)
-        if BlacklistedToken.check_blacklist(access_token):
+        cache_key = token_key(access_token)
+        payload = _decoded_tokens.get(cache_key)
+        if payload is None:
+            try:
+                key = current_app.config.get("SECRET_KEY")
+                payload = jwt.decode(access_token, key, algorithms=["HS256"])
+            except jwt.ExpiredSignatureError:
+                error = "Access token expired. Please log in again."
+                return Result.Fail(error)
+            except jwt.InvalidTokenError:
+                error = "Invalid token. Please log in again."
+                return Result.Fail(error)
+            _decoded_tokens.set(cache_key, payload, expires_at=payload["exp"])
+        jti = payload.get("jti") or cache_key.hex()
+        if BlacklistedToken.check_blacklist(jti, payload["exp"]):
             error = "Token blacklisted. Please log in again."
             return Result.Fail(error)
         user_dict = dict(
             public_id=payload["sub"],
             admin=payload["admin"],
             token=access_token,
+            jti=jti,
             expires_at=payload["exp"],
         )
         return Result.Ok(user_dict)
+
+    @staticmethod
+    def forget_access_token(access_token):
+        """Drop a verified token from the decoded token cache."""
+        _decoded_tokens.pop(token_key(access_token))
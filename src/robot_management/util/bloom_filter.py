@@ -0,0 +1,63 @@
+"""Bloom filter over a bytearray or a memory-mapped file shared between processes."""
+import hashlib
+import math
+import mmap
+import os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class BloomFilter:
+    """Probabilistic set: no false negatives, false positives at error_rate.
+
+    Stores about -ln(error_rate) / ln(2)^2 bits per key (~14 bits at 0.1%)
+    instead of the key itself. When created with a path, the bits live in a
+    memory-mapped file so every process opening the same path sees keys added
+    by the others immediately; writers serialize with an exclusive flock.
+    """
+
+    def __init__(self, capacity, error_rate=0.001, path=None):
+        bits_per_key = -math.log(error_rate) / math.log(2) ** 2
+        num_bytes = max(1, math.ceil(capacity * bits_per_key / 8))
+        self.num_bits = num_bytes * 8
+        self.num_hashes = max(1, round(bits_per_key * math.log(2)))
+        self.path = path
+        self._file = None
+        if path is None:
+            self._bits = bytearray(num_bytes)
+            return
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size < num_bytes:
+            self._file.truncate(num_bytes)
+        self._bits = mmap.mmap(self._file.fileno(), num_bytes)
+
+    def __contains__(self, key):
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key):
+        positions = list(self._positions(key))
+        if self._file is not None and fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            for p in positions:
+                self._bits[p >> 3] |= 1 << (p & 7)
+        finally:
+            if self._file is not None and fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        if self._file is not None:
+            self._bits.close()
+            self._file.close()
+            self._file = None
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
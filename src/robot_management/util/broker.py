@@ -0,0 +1,85 @@
+"""In-process publish/subscribe fan-out with bounded per-subscriber buffers."""
+import threading
+from collections import deque
+
+
+class Subscription:
+    """Events delivered to one subscriber, oldest first.
+
+    The buffer holds at most maxsize events. A subscriber that falls further
+    behind is marked as overflowed and receives nothing more; it is expected
+    to resubscribe and catch up from the authoritative store, so a slow
+    client never makes the publisher block or memory grow.
+    """
+
+    def __init__(self, broker, maxsize, predicate=None):
+        self.overflowed = False
+        self._broker = broker
+        self._predicate = predicate
+        self._events = deque()
+        self._maxsize = maxsize
+        self._ready = threading.Condition()
+
+    def get(self, timeout=None):
+        """Wait for the next events, returning them all (empty on timeout)."""
+        with self._ready:
+            if not self._events and not self.overflowed:
+                self._ready.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def close(self):
+        self._broker.unsubscribe(self)
+
+    def _deliver(self, event):
+        if self._predicate is not None and not self._predicate(event):
+            return
+        with self._ready:
+            if self.overflowed:
+                return
+            if len(self._events) >= self._maxsize:
+                self._events.clear()
+                self.overflowed = True
+            else:
+                self._events.append(event)
+            self._ready.notify()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Broker:
+    """Fan events out to every current subscriber of this process."""
+
+    def __init__(self, buffer_size=100):
+        self.buffer_size = buffer_size
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, predicate=None):
+        subscription = Subscription(self, self.buffer_size, predicate)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription._deliver(event)
+
+    def stats(self):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return dict(
+            subscribers=len(subscriptions),
+            overflowed=sum(s.overflowed for s in subscriptions),
+        )
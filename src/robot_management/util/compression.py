@@ -0,0 +1,129 @@
+"""Flask extension that gzip/brotli-compresses responses the client accepts."""
+import zlib
+
+from flask import current_app, request
+
+from src.robot_management.util.ttl_cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def representation_etags(etag):
+    """Every ETag Compress may send for a response whose identity ETag is etag."""
+    return [etag] + [f"{etag}-{encoding}" for encoding in ENCODINGS]
+
+
+class Compress:
+    """Compress responses with a compressible mimetype on their way out.
+
+    Bodies under COMPRESS_MIN_SIZE bytes are left alone. Streamed responses
+    are compressed chunk by chunk and flushed after each chunk, so clients
+    still receive rows as they are produced. Compressed bodies of responses
+    carrying an ETag are kept in an LRU keyed by (path, ETag, encoding):
+    an ETag names one version of the data, so repeated hits skip the
+    compression work. Each encoding gets its own strong ETag (suffix
+    "-gzip" / "-br"); see representation_etags().
+    """
+
+    def __init__(self, app=None):
+        self.cache = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.cache = TTLCache(maxsize=app.config.get("COMPRESS_CACHE_SIZE"))
+        app.after_request(self.after_request)
+        app.extensions["compress"] = self
+
+    def after_request(self, response):
+        config = current_app.config
+        if response.mimetype not in config["COMPRESS_MIMETYPES"]:
+            return response
+        response.vary.add("Accept-Encoding")
+        if (
+            response.status_code < 200
+            or response.status_code >= 300
+            or response.status_code == 204
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or "no-transform" in response.headers.get("Cache-Control", "")
+        ):
+            return response
+        encoding = request.accept_encodings.best_match(ENCODINGS)
+        if encoding is None:
+            return response
+        if response.is_streamed:
+            response.response = self._compress_stream(
+                response.response, encoding, config
+            )
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < config["COMPRESS_MIN_SIZE"]:
+                return response
+            etag, weak = response.get_etag()
+            if etag and not weak:
+                key = (request.path, etag, encoding)
+                compressed = self.cache.get(key)
+                if compressed is None:
+                    compressed = self._compress(data, encoding, config)
+                    self.cache.set(key, compressed)
+                response.set_etag(f"{etag}-{encoding}")
+            else:
+                compressed = self._compress(data, encoding, config)
+            response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _compress(self, data, encoding, config):
+        compressor = _compressor(encoding, config)
+        return compressor.compress(data) + compressor.flush()
+
+    def _compress_stream(self, chunks, encoding, config):
+        compressor = _compressor(encoding, config)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            data = compressor.compress(chunk) + compressor.sync_flush()
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class _GzipCompressor:
+    def __init__(self, level):
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._zlib.compress(data)
+
+    def sync_flush(self):
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self):
+        return self._zlib.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality):
+        self._brotli = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._brotli.process(data)
+
+    def sync_flush(self):
+        return self._brotli.flush()
+
+    def flush(self):
+        return self._brotli.finish()
+
+
+def _compressor(encoding, config):
+    if encoding == "br":
+        return _BrotliCompressor(config["COMPRESS_BROTLI_QUALITY"])
+    return _GzipCompressor(config["COMPRESS_LEVEL"])
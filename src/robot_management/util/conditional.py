@@ -0,0 +1,37 @@
+"""Conditional GET support: ETag / Last-Modified validators and 304 responses."""
+from http import HTTPStatus
+
+from flask import Response, request
+
+from src.robot_management.util.compression import representation_etags
+
+
+def conditional_response(name, version, updated_at, build, cache_control="no-cache"):
+    """Answer 304 if the client's validators match, else build() the response.
+
+    version and updated_at identify the current state of the data that build
+    would serialize (see TableVersion), so a matching client is answered
+    without querying or serializing anything.
+    """
+    etag = f"{name}-{version}"
+    not_modified = Response(status=HTTPStatus.NOT_MODIFIED)
+    if request.if_none_match:
+        for representation in representation_etags(etag):
+            if request.if_none_match.contains(representation):
+                return _add_validators(
+                    not_modified, representation, updated_at, cache_control
+                )
+    elif updated_at is not None and request.if_modified_since is not None:
+        if updated_at.replace(microsecond=0) <= request.if_modified_since.replace(
+            tzinfo=None
+        ):
+            return _add_validators(not_modified, etag, updated_at, cache_control)
+    return _add_validators(build(), etag, updated_at, cache_control)
+
+
+def _add_validators(response, etag, updated_at, cache_control):
+    response.set_etag(etag)
+    if updated_at is not None:
+        response.last_modified = updated_at
+    response.headers["Cache-Control"] = cache_control
+    return response
@@ -0,0 +1,89 @@
+"""SQLAlchemy connection pool that records checkout wait times."""
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Counters for connection checkouts from one pool (one per process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, waited, timed_out=False):
+        with self._lock:
+            self.checkouts += not timed_out
+            self.timeouts += timed_out
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def as_dict(self):
+        with self._lock:
+            return dict(
+                checkouts=self.checkouts,
+                timeouts=self.timeouts,
+                wait_seconds=round(self.wait_seconds, 6),
+                max_wait_seconds=round(self.max_wait_seconds, 6),
+            )
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection.
+
+    Select it with SQLALCHEMY_ENGINE_OPTIONS["poolclass"]; pool_stats() then
+    reports the wait times next to the usual size/overflow figures.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self._depth = threading.local()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outer call.
+        depth = getattr(self._depth, "value", 0)
+        if depth:
+            return super()._do_get()
+        self._depth.value = 1
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        finally:
+            self._depth.value = 0
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+def pool_stats(engine):
+    """Describe the state of engine's connection pool as a JSON-ready dict."""
+    pool = engine.pool
+    stats = dict(pool_class=type(pool).__name__)
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    else:
+        stats.update(status=pool.status())
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.as_dict())
+    return stats
@@ -0,0 +1,188 @@
+"""Flask-SQLAlchemy subclass that routes read-only requests to replicas."""
+import hashlib
+import itertools
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy import SignallingSession, SQLAlchemy
+from sqlalchemy import create_engine, exc, orm, text
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+
+from src.robot_management.util.ttl_cache import TTLCache
+
+READ_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+PRIMARY_COOKIE = "read_primary_until"
+
+_POSTGRES_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaSet:
+    """Engines for the configured replicas, with cached replication lag checks.
+
+    choose() returns the next replica (round robin) whose lag, measured at
+    most every REPLICA_LAG_CHECK_SECONDS, is below REPLICA_MAX_LAG_SECONDS,
+    or None when every replica lags or is unreachable.
+    """
+
+    def __init__(self, urls, engine_options, max_lag, check_interval):
+        self.engines = [create_engine(url, **engine_options) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lags = {}
+        self._lock = threading.Lock()
+        self._next = itertools.cycle(range(len(self.engines)))
+
+    def choose(self):
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._next)
+            engine = self.engines[index]
+            if self.lag(engine) <= self.max_lag:
+                return engine
+        return None
+
+    def lag(self, engine):
+        """Replication lag of engine in seconds (infinite if unreachable)."""
+        checked_at, lag = self._lags.get(engine, (None, None))
+        now = time.monotonic()
+        if checked_at is None or now - checked_at > self.check_interval:
+            lag = self._measure_lag(engine)
+            self._lags[engine] = (now, lag)
+        return lag
+
+    def stats(self):
+        return [
+            dict(url=repr(engine.url), lag_seconds=self._lags.get(engine, (None, None))[1])
+            for engine in self.engines
+        ]
+
+    def _measure_lag(self, engine):
+        if engine.dialect.name != "postgresql":
+            return 0.0
+        try:
+            with engine.connect() as connection:
+                return float(connection.execute(_POSTGRES_LAG).scalar() or 0.0)
+        except exc.DBAPIError:
+            return float("inf")
+
+
+class RoutingSession(SignallingSession):
+    """Session whose reads go to the replica chosen for the current request.
+
+    Anything that writes (a flush, pending objects, or a DML statement) pins
+    the rest of the request to the primary, as do models that set
+    __read_from_primary__ (e.g. the token blacklist, which must not lag).
+    """
+
+    def get_primary_bind(self, mapper=None):
+        """The primary engine, even while the request reads from a replica."""
+        return super().get_bind(mapper)
+
+    def get_bind(self, mapper=None, clause=None):
+        replica = _current_replica()
+        if replica is not None:
+            if self._flushing or self._new or self._deleted or _is_write(clause):
+                g.db_replica = None
+            elif not _reads_from_primary(mapper):
+                return replica
+        return super().get_bind(mapper, clause)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """SQLAlchemy extension that sends read-only requests to replicas.
+
+    Replicas are listed in REPLICA_DATABASE_URLS. GET/HEAD/OPTIONS requests
+    read from a replica unless the client wrote within the last
+    READ_YOUR_WRITES_SECONDS. That is remembered per process by auth token
+    (or client address) and across processes by a cookie, so clients see
+    their own writes. Without replicas every query uses the primary.
+    """
+
+    def init_app(self, app):
+        super().init_app(app)
+        app.before_request(_route_request)
+        app.after_request(_remember_write)
+        app.teardown_request(_reset_route)
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+def get_replicas(app=None):
+    """The ReplicaSet of app, built on first use; None without replicas."""
+    app = app or current_app
+    if "db_replicas" not in app.extensions:
+        urls = app.config.get("REPLICA_DATABASE_URLS")
+        app.extensions["db_replicas"] = (
+            ReplicaSet(
+                urls,
+                app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {},
+                max_lag=app.config.get("REPLICA_MAX_LAG_SECONDS"),
+                check_interval=app.config.get("REPLICA_LAG_CHECK_SECONDS"),
+            )
+            if urls
+            else None
+        )
+    return app.extensions["db_replicas"]
+
+
+_recent_writers = TTLCache(maxsize=100000)
+
+
+def _route_request():
+    g.db_replica = None
+    if request.method not in READ_METHODS:
+        return
+    replicas = get_replicas()
+    if replicas is None or _wrote_recently():
+        return
+    g.db_replica = replicas.choose()
+
+
+def _remember_write(response):
+    if request.method in READ_METHODS or response.status_code >= 400:
+        return response
+    window = current_app.config.get("READ_YOUR_WRITES_SECONDS")
+    if not window or get_replicas() is None:
+        return response
+    until = time.time() + window
+    _recent_writers.set(_client_key(), True, expires_at=until)
+    response.set_cookie(PRIMARY_COOKIE, f"{until:.0f}", max_age=window, httponly=True)
+    return response
+
+
+def _reset_route(exception=None):
+    g.pop("db_replica", None)
+
+
+def _wrote_recently():
+    if _recent_writers.get(_client_key()):
+        return True
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _client_key():
+    credentials = request.headers.get("Authorization") or request.remote_addr or ""
+    return hashlib.blake2b(credentials.encode("utf-8"), digest_size=16).digest()
+
+
+def _current_replica():
+    return g.get("db_replica") if has_request_context() else None
+
+
+def _is_write(clause):
+    # Raw SQL text may be DDL or DML, so it always runs on the primary.
+    return isinstance(clause, (UpdateBase, TextClause))
+
+
+def _reads_from_primary(mapper):
+    return mapper is not None and getattr(mapper.class_, "__read_from_primary__", False)
@@ -0,0 +1,99 @@
+"""Versioned in-memory index of a small id/name/type lookup table."""
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import select
+
+Snapshot = namedtuple(
+    "Snapshot", ["by_id", "by_name", "types", "fingerprint", "loaded_at"]
+)
+
+
+class DimensionIndex:
+    """Cache every (id, name, type) row of a model so lookups skip the database.
+
+    The index is loaded lazily on first use and dropped by invalidate(), which
+    the business functions call after committing a create, update or delete.
+    Other worker processes are not notified, so snapshots older than
+    DIMENSION_CACHE_TTL seconds are reloaded to bound their staleness, and a
+    lookup that misses reloads the snapshot first if it is older than
+    DIMENSION_MISS_RELOAD_SECONDS, so rows created by another worker are
+    found at once while a stream of bad names costs one query per interval.
+    Snapshots are always read from the primary: one loaded from a lagging
+    replica right after invalidate() would be cached without the new row.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version = 0
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self.version += 1
+
+    @property
+    def snapshot(self):
+        snapshot = self._snapshot
+        ttl = current_app.config.get("DIMENSION_CACHE_TTL")
+        if snapshot is None or (ttl and time.monotonic() - snapshot.loaded_at > ttl):
+            snapshot = self._load()
+        return snapshot
+
+    @property
+    def fingerprint(self):
+        return self.snapshot.fingerprint
+
+    def has_id(self, id):
+        return self._lookup(lambda snapshot: id in snapshot.by_id)
+
+    def has_name(self, name):
+        return self._lookup(lambda snapshot: name in snapshot.by_name)
+
+    def has_type(self, type):
+        return self._lookup(lambda snapshot: type in snapshot.types)
+
+    def id_for_name(self, name):
+        return self._lookup(lambda snapshot: snapshot.by_name.get(name))
+
+    def _lookup(self, find):
+        snapshot = self.snapshot
+        found = find(snapshot)
+        if found is not None and found is not False:
+            return found
+        interval = current_app.config.get("DIMENSION_MISS_RELOAD_SECONDS")
+        if time.monotonic() - snapshot.loaded_at >= interval:
+            return find(self._load())
+        return found
+
+    def _load(self):
+        version = self.version
+        model = self.model
+        session = model.query.session
+        get_bind = getattr(session, "get_primary_bind", session.get_bind)
+        columns = model.__table__.c
+        result = session.execute(
+            select([columns.id, columns.name, columns.type]),
+            bind=get_bind(model.__mapper__),
+        )
+        rows = sorted(tuple(row) for row in result)
+        fingerprint = hashlib.sha1(repr(rows).encode("utf-8")).hexdigest()
+        snapshot = Snapshot(
+            by_id={id: (name, type) for id, name, type in rows},
+            by_name={name: id for id, name, _ in rows},
+            types=frozenset(type for _, _, type in rows),
+            fingerprint=fingerprint,
+            loaded_at=time.monotonic(),
+        )
+        with self._lock:
+            if self.version == version:
+                previous = self._snapshot
+                if previous and previous.fingerprint != fingerprint:
+                    self.version += 1
+                self._snapshot = snapshot
+        return snapshot
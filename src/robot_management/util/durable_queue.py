@@ -0,0 +1,111 @@
+"""Append-only work queue in a local SQLite journal, shared by worker processes."""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class DurableQueue:
+    """FIFO of JSON payloads that survives process crashes.
+
+    put() returns once the payloads are fsynced to the journal. Consumers
+    claim() a batch under a lease and ack() it after processing. Claims whose
+    lease ran out (the consumer died) are handed out again, so every payload
+    is delivered at least once. Payloads that keep failing can be bury()-ed:
+    they stay in the journal for inspection but are never claimed again.
+    """
+
+    def __init__(self, path, lease_seconds=60):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS queue ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " payload TEXT NOT NULL,"
+            " enqueued_at REAL NOT NULL,"
+            " claimed_until REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " buried INTEGER NOT NULL DEFAULT 0)"
+        )
+
+    def put(self, payloads):
+        now = time.time()
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO queue (payload, enqueued_at) VALUES (?, ?)",
+                [(json.dumps(payload), now) for payload in payloads],
+            )
+
+    def claim(self, limit):
+        """Lease up to limit pending payloads, returning [(id, payload, attempts)]."""
+        now = time.time()
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT id, payload, attempts FROM queue "
+                "WHERE buried = 0 AND (claimed_until IS NULL OR claimed_until < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE queue SET claimed_until = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                [(now + self.lease_seconds, id) for id, _, _ in rows],
+            )
+        return [(id, json.loads(payload), attempts + 1) for id, payload, attempts in rows]
+
+    def ack(self, ids):
+        with self._transaction() as connection:
+            connection.executemany("DELETE FROM queue WHERE id = ?", [(id,) for id in ids])
+
+    def release(self, ids):
+        """Make claimed payloads available again without waiting for the lease."""
+        with self._transaction() as connection:
+            connection.executemany(
+                "UPDATE queue SET claimed_until = NULL WHERE id = ?", [(id,) for id in ids]
+            )
+
+    def bury(self, ids):
+        with self._transaction() as connection:
+            connection.executemany(
+                "UPDATE queue SET buried = 1 WHERE id = ?", [(id,) for id in ids]
+            )
+
+    def stats(self):
+        pending, buried, oldest = self._connection().execute(
+            "SELECT SUM(buried = 0), SUM(buried = 1), MIN(CASE WHEN buried = 0 "
+            "THEN enqueued_at END) FROM queue"
+        ).fetchone()
+        return dict(
+            pending=pending or 0,
+            buried=buried or 0,
+            oldest_age_seconds=round(time.time() - oldest, 3) if oldest else 0.0,
+        )
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            self._local.connection = connection
+        return connection
+
+
+class _Transaction:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
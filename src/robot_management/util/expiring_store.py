@@ -0,0 +1,129 @@
+"""Expiring key/value store: in-process LRU plus an optional shared SQLite file."""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from src.robot_management.util.ttl_cache import TTLCache
+
+
+class ExpiringStore:
+    """Map short (digest) keys to values that expire after a TTL.
+
+    add() is atomic: it only stores a key that is absent or expired, which
+    makes the store usable for "first writer wins" checks. With a path, keys
+    also live in a SQLite file shared by every worker process on the host;
+    without one they are only visible to the current process.
+
+    Values that another worker may still replace (such as an "in progress"
+    marker) must be added and read with cache=False: the in-process LRU is
+    only consulted for keys, not refreshed from the file.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, maxsize, path=None):
+        self.path = path
+        self._local_cache = TTLCache(maxsize)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection().execute(
+                "CREATE TABLE IF NOT EXISTS store "
+                "(key BLOB PRIMARY KEY, value BLOB, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key, default=None, cache=True):
+        """Return the value of key; with cache=False it is not kept in the LRU."""
+        value = self._local_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.path:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM store WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+            if row is not None:
+                value = pickle.loads(row[0])
+                if cache:
+                    self._local_cache.set(key, value, expires_at=row[1])
+                return value
+        return default
+
+    def add(self, key, value, ttl, cache=True):
+        """Store value under key unless the key exists; True if it was stored."""
+        return self.add_many([key], value, ttl, cache=cache)[0]
+
+    def add_many(self, keys, value, ttl, cache=True):
+        """add() for every key in order, returning one flag per key.
+
+        With a shared file and cache=False the values are only written to
+        the file, so a later set() by any worker is seen by every other one.
+        """
+        expires_at = time.time() + ttl
+        added = []
+        with self._lock:
+            for key in keys:
+                if self._local_cache.get(key, _MISSING) is not _MISSING:
+                    added.append(False)
+                    continue
+                if self.path and not self._add_shared(key, value, expires_at):
+                    added.append(False)
+                    continue
+                if cache or not self.path:
+                    self._local_cache.set(key, value, expires_at=expires_at)
+                added.append(True)
+        return added
+
+    def set(self, key, value, ttl):
+        expires_at = time.time() + ttl
+        self._local_cache.set(key, value, expires_at=expires_at)
+        if self.path:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO store VALUES (?, ?, ?)",
+                (key, pickle.dumps(value), expires_at),
+            )
+
+    def delete_many(self, keys):
+        for key in keys:
+            self._local_cache.pop(key)
+        if self.path:
+            self._connection().executemany(
+                "DELETE FROM store WHERE key = ?", [(key,) for key in keys]
+            )
+
+    def clear(self):
+        self._local_cache.clear()
+        if self.path:
+            self._connection().execute("DELETE FROM store")
+
+    def _add_shared(self, key, value, expires_at):
+        connection = self._connection()
+        now = time.time()
+        cursor = connection.execute(
+            "INSERT INTO store VALUES (?, ?, ?) ON CONFLICT (key) DO UPDATE "
+            "SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE store.expires_at <= ?",
+            (key, pickle.dumps(value), expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            connection.execute("DELETE FROM store WHERE expires_at <= ?", (now,))
+        return cursor.rowcount == 1
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+
+_MISSING = object()
@@ -0,0 +1,40 @@
+"""Fixed-window counters of failed attempts, used to throttle login."""
+import math
+import threading
+import time
+
+from src.robot_management.util.ttl_cache import TTLCache
+
+
+class FailureThrottle:
+    """Count failures per key and block a key once it reaches its limit.
+
+    The first failure opens a window of window_seconds; the key is blocked
+    while the window holds limit or more failures. Counters are kept per
+    process in a bounded LRU, so an attacker rotating keys can only evict
+    old counters, not exhaust memory.
+    """
+
+    def __init__(self, maxsize=100000):
+        self._failures = TTLCache(maxsize)
+        self._lock = threading.Lock()
+
+    def retry_after(self, key, limit):
+        """Seconds until key may try again, or 0 if it is not blocked."""
+        entry = self._failures.get(key)
+        if entry is None or entry[0] < limit:
+            return 0
+        return max(1, math.ceil(entry[1] - time.time()))
+
+    def record_failure(self, key, window_seconds):
+        with self._lock:
+            count, reset_at = self._failures.get(key, (0, None))
+            if reset_at is None:
+                reset_at = time.time() + window_seconds
+            self._failures.set(key, (count + 1, reset_at), expires_at=reset_at)
+
+    def reset(self, key):
+        self._failures.pop(key)
+
+    def clear(self):
+        self._failures.clear()
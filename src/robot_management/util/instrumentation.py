@@ -0,0 +1,135 @@
+"""Flask extension timing each request: SQL, auth and serialization."""
+import json
+from contextlib import contextmanager
+from time import perf_counter
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestTimings:
+    """Counters for the request currently handled by this app context."""
+
+    __slots__ = ("start", "sql_count", "sql_time", "phases")
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.phases = {}
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+def current_timings():
+    """The RequestTimings of the current request, or None outside of one."""
+    return g.get("request_timings") if has_app_context() else None
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to phase name of the current request."""
+    timings = current_timings()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, perf_counter() - start)
+
+
+class Instrumentation:
+    """Report where each request spent its time.
+
+    Every SQL statement on any engine (primary and replicas) is counted and
+    timed through SQLAlchemy cursor events; code paths wrapped in timed()
+    add named phases ("auth", "serialize"). After the request the totals are
+    sent as a Server-Timing header, which browser dev tools display, and
+    logged as one JSON line. All of it is a few perf_counter() calls per
+    statement, so it is cheap enough to leave enabled in production.
+
+    Streamed bodies (exports, server-sent events) are produced after the
+    response leaves the app, so only the time to start them is reported.
+    """
+
+    _listening = False
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get("INSTRUMENTATION_ENABLED"):
+            return
+        if not Instrumentation._listening:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(Engine, "handle_error", _handle_error)
+            Instrumentation._listening = True
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+        app.extensions["instrumentation"] = self
+
+    def before_request(self):
+        g.request_timings = RequestTimings()
+
+    def after_request(self, response):
+        timings = g.pop("request_timings", None)
+        if timings is None:
+            return response
+        total = perf_counter() - timings.start
+        sql_ms = timings.sql_time * 1000
+        metrics = [
+            f"app;dur={total * 1000:.1f}",
+            f'db;dur={sql_ms:.1f};desc="{timings.sql_count} queries"',
+        ]
+        metrics += [
+            f"{name};dur={seconds * 1000:.1f}"
+            for name, seconds in timings.phases.items()
+        ]
+        response.headers.add("Server-Timing", ", ".join(metrics))
+        if current_app.config.get("INSTRUMENTATION_LOG"):
+            record = dict(
+                method=request.method,
+                path=request.path,
+                endpoint=request.endpoint,
+                status=response.status_code,
+                duration_ms=round(total * 1000, 1),
+                sql_count=timings.sql_count,
+                sql_ms=round(sql_ms, 1),
+            )
+            for name, seconds in timings.phases.items():
+                record[f"{name}_ms"] = round(seconds * 1000, 1)
+            current_app.logger.info(json.dumps(record))
+        return response
+
+    def teardown_request(self, exc):
+        g.pop("request_timings", None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_timings() is not None:
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = perf_counter() - starts.pop()
+    timings = current_timings()
+    if timings is not None:
+        timings.sql_count += 1
+        timings.sql_time += elapsed
+
+
+def _handle_error(context):
+    if context.connection is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
@@ -0,0 +1,74 @@
+"""Keyset (cursor) pagination for SQLAlchemy queries."""
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+Cursor = namedtuple("Cursor", ["values", "backward"])
+Page = namedtuple("Page", ["items", "next", "prev"])
+
+
+def encode_cursor(values, backward=False):
+    """Encode the sort key of a row as an opaque, URL-safe cursor string."""
+    payload = dict(k=[_encode_value(v) for v in values], b=backward)
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor_str):
+    """Validation method for a cursor created by encode_cursor."""
+    try:
+        padded = cursor_str + "=" * (-len(cursor_str) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [_decode_value(v) for v in payload["k"]]
+        return Cursor(values, bool(payload["b"]))
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise ValueError(f"'{cursor_str}' is not a valid pagination cursor.")
+
+
+def keyset_paginate(query, columns, cursor=None, limit=100):
+    """Return one page of query results ordered by columns, seeking past cursor.
+
+    The columns must form a unique sort key (e.g. a timestamp followed by the
+    primary key). Instead of OFFSET, each page filters on the sort key of the
+    last row seen, so page N costs the same as page 1 when an index exists.
+    """
+    backward = bool(cursor and cursor.backward)
+    if cursor:
+        key = tuple_(*columns)
+        bound = tuple_(*cursor.values)
+        query = query.filter(key < bound if backward else key > bound)
+    order_by = [c.desc() for c in columns] if backward else list(columns)
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+    if not rows:
+        return Page(rows, None, None)
+
+    def sort_key(row):
+        return [getattr(row, c.key) for c in columns]
+
+    more_after = has_more if not backward else True
+    more_before = has_more if backward else cursor is not None
+    next_cursor = encode_cursor(sort_key(rows[-1])) if more_after else None
+    prev_cursor = (
+        encode_cursor(sort_key(rows[0]), backward=True) if more_before else None
+    )
+    return Page(rows, next_cursor, prev_cursor)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["dt"])
+    return value
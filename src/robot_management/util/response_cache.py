@@ -0,0 +1,104 @@
+"""Two-level store for rendered responses: in-process LRU plus a shared file."""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from src.robot_management.util.ttl_cache import TTLCache
+
+
+class SharedCacheBackend:
+    """Cache entries in a SQLite file that every worker process on a host opens."""
+
+    PRUNE_EVERY = 500
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS response_cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key, value, expires_at):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?)",
+            (key, pickle.dumps(value), expires_at),
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            connection.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),)
+            )
+
+    def clear(self):
+        self._connection().execute("DELETE FROM response_cache")
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+
+class ResponseCache:
+    """In-process LRU of rendered responses, backed by an optional shared file.
+
+    With RESPONSE_CACHE_PATH set, entries are also written to a SQLite file
+    (relative paths are resolved against the app instance folder) so other
+    worker processes on the host can reuse them; local misses fall through
+    to it. See api/caching.py for how keys are built and invalidated.
+    """
+
+    def __init__(self, app=None):
+        self.local = None
+        self.shared = None
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.local = TTLCache(maxsize=app.config.get("RESPONSE_CACHE_SIZE"))
+        path = app.config.get("RESPONSE_CACHE_PATH")
+        self.shared = (
+            SharedCacheBackend(os.path.join(app.instance_path, path)) if path else None
+        )
+        app.extensions["response_cache"] = self
+
+    def get(self, key):
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            shared_entry = self.shared.get(key)
+            if shared_entry is not None:
+                entry, expires_at = shared_entry
+                self.local.set(key, entry, expires_at=expires_at)
+        return entry
+
+    def set(self, key, entry, ttl):
+        expires_at = time.time() + ttl
+        self.local.set(key, entry, expires_at=expires_at)
+        if self.shared is not None:
+            self.shared.set(key, entry, expires_at)
+
+    def clear(self):
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
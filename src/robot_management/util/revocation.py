@@ -0,0 +1,80 @@
+"""Bloom-filter based revocation list for short-lived access tokens."""
+import os
+import threading
+import time
+
+from src.robot_management.util.bloom_filter import BloomFilter
+
+
+class RevocationFilter:
+    """Revoked token ids, held in one Bloom filter per expiry time bucket.
+
+    A token only has to be remembered until it expires, so keys are filed
+    under the bucket of their expiry time and whole buckets are dropped once
+    that time has passed, instead of deleting keys from a filter (which Bloom
+    filters cannot do). With a directory, buckets are memory-mapped files
+    shared by every worker process on the host.
+    """
+
+    def __init__(self, capacity, error_rate, bucket_seconds, directory=None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bucket_seconds = bucket_seconds
+        self.directory = directory
+        self._filters = {}
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def add(self, key, expires_at):
+        self._filter(expires_at).add(key)
+
+    def might_contain(self, key, expires_at):
+        return key in self._filter(expires_at)
+
+    def prune(self, now=None):
+        """Drop the filters of buckets whose tokens have all expired."""
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_seconds)
+        with self._lock:
+            expired = [bucket for bucket in self._filters if bucket < current]
+            for bucket in expired:
+                self._filters.pop(bucket).close()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                bucket = _bucket_from_filename(name)
+                if bucket is not None and bucket < current:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        pass
+
+    def close(self):
+        with self._lock:
+            for bloom in self._filters.values():
+                bloom.close()
+            self._filters.clear()
+
+    def _filter(self, expires_at):
+        bucket = int(expires_at // self.bucket_seconds)
+        bloom = self._filters.get(bucket)
+        if bloom is not None:
+            return bloom
+        with self._lock:
+            bloom = self._filters.get(bucket)
+            if bloom is None:
+                path = None
+                if self.directory:
+                    path = os.path.join(self.directory, f"revoked-{bucket}.bloom")
+                bloom = BloomFilter(self.capacity, self.error_rate, path=path)
+                self._filters[bucket] = bloom
+        return bloom
+
+
+def _bucket_from_filename(name):
+    if name.startswith("revoked-") and name.endswith(".bloom"):
+        try:
+            return int(name[len("revoked-") : -len(".bloom")])
+        except ValueError:
+            return None
+    return None
@@ -0,0 +1,28 @@
+"""Background thread running a function periodically inside an app context."""
+import threading
+
+
+class PeriodicTask(threading.Thread):
+    """Daemon thread calling func every interval seconds until stopped.
+
+    Exceptions are logged and do not stop the schedule. Every worker process
+    runs its own thread, so func must be safe to run concurrently.
+    """
+
+    def __init__(self, app, interval, func, name=None):
+        super().__init__(name=name, daemon=True)
+        self.app = app
+        self.interval = interval
+        self.func = func
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    self.func()
+                except Exception:
+                    self.app.logger.exception("Periodic task %s failed", self.name)
+
+    def stop(self):
+        self._stopped.set()
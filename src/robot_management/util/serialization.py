@@ -0,0 +1,100 @@
+"""JSON encoding for API responses, using orjson when it is installed."""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from http import HTTPStatus
+from operator import attrgetter
+from time import perf_counter
+
+from flask import Response
+
+from src.robot_management.util.instrumentation import current_timings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JSON_MIMETYPE = "application/json"
+
+
+def _default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_stdlib(obj):
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def _dumps_orjson(obj):
+    return orjson.dumps(obj, default=_default)
+
+
+_BACKENDS = {"json": _dumps_stdlib}
+if orjson is not None:
+    _BACKENDS["orjson"] = _dumps_orjson
+_dumps = _BACKENDS.get("orjson", _dumps_stdlib)
+
+
+def use_backend(name):
+    """Select the JSON backend ("orjson" or "json"), falling back to json."""
+    global _dumps
+    _dumps = _BACKENDS.get(name, _dumps_stdlib)
+    return "orjson" if _dumps is _dumps_orjson else "json"
+
+
+def dumps(obj):
+    """Encode obj as compact UTF-8 JSON bytes; datetimes become ISO 8601."""
+    timings = current_timings()
+    if timings is None:
+        return _dumps(obj)
+    start = perf_counter()
+    try:
+        return _dumps(obj)
+    finally:
+        timings.add("serialize", perf_counter() - start)
+
+
+def json_response(obj, status=HTTPStatus.OK, headers=None):
+    response = Response(dumps(obj), status=status, mimetype=JSON_MIMETYPE)
+    if headers:
+        response.headers.extend(headers)
+    return response
+
+
+class ModelEncoder:
+    """Turn model instances into JSON-ready dicts.
+
+    fields maps output keys to attribute paths ("robot.name" is allowed) or to
+    (attribute, encoder) pairs for related objects. All attributes are read
+    by a single attrgetter built up front, so encoding an object costs one C
+    call plus a dict(zip()).
+    """
+
+    def __init__(self, fields):
+        self.keys = tuple(fields)
+        attributes = []
+        nested = []
+        for key, source in fields.items():
+            if isinstance(source, tuple):
+                source, encoder = source
+                nested.append((key, encoder))
+            attributes.append(source)
+        getter = attrgetter(*attributes)
+        self._get = getter if len(attributes) > 1 else lambda obj: (getter(obj),)
+        self._nested = tuple(nested)
+
+    def __call__(self, obj):
+        item = dict(zip(self.keys, self._get(obj)))
+        for key, encoder in self._nested:
+            value = item[key]
+            if value is not None:
+                item[key] = encoder(value)
+        return item
+
+    def many(self, objs):
+        return [self(obj) for obj in objs]
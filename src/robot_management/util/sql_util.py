@@ -0,0 +1,27 @@
+"""Dialect-specific SQL expressions for date arithmetic."""
+from sqlalchemy import func
+
+_SQLITE_BUCKET_MODIFIERS = {
+    "hour": (),
+    "day": ("start of day",),
+    "week": ("start of day", "-6 days", "weekday 1"),
+}
+
+
+def duration_seconds(dialect_name, start, end):
+    """SQL expression for end - start, in seconds."""
+    if dialect_name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * 86400.0
+
+
+def time_bucket(dialect_name, bucket, column, isoformat=True):
+    """SQL expression truncating a timestamp column to an hour, day or week.
+
+    Weeks start on Monday. On SQLite the result is a string: ISO 8601 when
+    isoformat is set, otherwise the format SQLAlchemy uses to store DateTime.
+    """
+    if dialect_name == "postgresql":
+        return func.date_trunc(bucket, column)
+    format = "%Y-%m-%dT%H:00:00" if isoformat else "%Y-%m-%d %H:00:00.000000"
+    return func.strftime(format, column, *_SQLITE_BUCKET_MODIFIERS[bucket])
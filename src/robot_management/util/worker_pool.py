@@ -0,0 +1,78 @@
+"""Bounded thread pool that rejects work instead of queueing it indefinitely."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class BoundedWorkerPool:
+    """Run CPU-heavy calls on max_workers threads with at most queue_size waiting.
+
+    Callers block until their call finishes, so the pool caps how many run at
+    once (and therefore how many cores they take from other requests) rather
+    than freeing the caller. Work that does not fit raises PoolSaturated
+    immediately so the caller can answer 503 instead of piling up. The callable
+    must release the GIL (bcrypt does) for the workers to run in parallel.
+    """
+
+    def __init__(self, max_workers, queue_size, name="worker"):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def run(self, func, *args, **kwargs):
+        """Call func(*args, **kwargs) on a worker and return its result."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PoolSaturated(f"{self.max_workers + self.queue_size} calls pending")
+        with self._lock:
+            self._in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            future = self._executor.submit(self._call, submitted, func, args, kwargs)
+            return future.result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                max_workers=self.max_workers,
+                queue_size=self.queue_size,
+                running=self._running,
+                queued=self._in_flight - self._running,
+                completed=self._completed,
+                rejected=self._rejected,
+                wait_seconds=round(self._wait_seconds, 6),
+                run_seconds=round(self._run_seconds, 6),
+            )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def _call(self, submitted, func, args, kwargs):
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._wait_seconds += started - submitted
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._run_seconds += time.perf_counter() - started
@@ -0,0 +1,59 @@
+"""Global pytest fixtures."""
+import pytest
+
+from src.robot_management import create_app
+from src.robot_management import db as database
+from src.robot_management.api.auth.business import login_failures
+from src.robot_management.models.robot import Robot, robot_index
+from src.robot_management.models.task import Task, task_index
+from src.robot_management.models.token_blacklist import BlacklistedToken
+from src.robot_management.models.user import User
+from tests.util import EMAIL, ADMIN_EMAIL, PASSWORD
+
+
+@pytest.fixture
+def app():
+    app = create_app("testing")
+    return app
+
+
+@pytest.fixture
+def db(app, client, request):
+    database.drop_all()
+    database.create_all()
+    database.session.commit()
+    robot_index.invalidate()
+    task_index.invalidate()
+    BlacklistedToken.reset_cache()
+    login_failures.clear()
+
+    def fin():
+        database.session.remove()
+
+    request.addfinalizer(fin)
+    return database
+
+
+@pytest.fixture
+def user(db):
+    user = User(email=EMAIL, password=PASSWORD)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def admin(db):
+    admin = User(email=ADMIN_EMAIL, password=PASSWORD, admin=True)
+    db.session.add(admin)
+    db.session.commit()
+    return admin
+
+
+@pytest.fixture
+def dimensions(db):
+    robot = Robot(name="r2d2", type="astromech")
+    task = Task(name="repair", type="maintenance")
+    db.session.add_all([robot, task])
+    db.session.commit()
+    return robot.id, task.id
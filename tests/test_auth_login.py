@@ -1,7 +1,10 @@
 """Unit tests for api.auth_login API endpoint."""
+import threading
 from http import HTTPStatus
 
+from src.robot_management.models import user as user_module
 from src.robot_management.models.user import User
+from src.robot_management.util.worker_pool import BoundedWorkerPool
 from tests.util import EMAIL, register_user, login_user
 
 SUCCESS = "successfully logged in"
@@ -29,3 +32,46 @@ def test_login_email_does_not_exist(client, db):
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert "message" in response.json and response.json["message"] == UNAUTHORIZED
     assert "access_token" not in response.json
+
+
+def test_login_hashing_pool_saturated(client, db, monkeypatch):
+    register_user(client)
+    pool = BoundedWorkerPool(max_workers=1, queue_size=0)
+    monkeypatch.setattr(user_module, "_hashing_pool", pool)
+    release = threading.Event()
+    busy = threading.Thread(target=pool.run, args=(release.wait,))
+    busy.start()
+    while not pool.stats()["running"]:
+        release.wait(0.01)
+    response = login_user(client)
+    release.set()
+    busy.join()
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert "access_token" not in response.json
+    assert pool.stats()["rejected"] == 1
+    assert login_user(client).status_code == HTTPStatus.OK
+    assert pool.stats()["completed"] == 2
+    pool.shutdown()
+
+
+def test_login_rehashes_password_with_configured_cost(app, client, db):
+    register_user(client)
+    user = User.find_by_email(EMAIL)
+    assert user.password_cost == app.config["BCRYPT_LOG_ROUNDS"]
+    app.config["BCRYPT_LOG_ROUNDS"] = user.password_cost + 1
+    assert login_user(client).status_code == HTTPStatus.OK
+    db.session.expire_all()
+    assert User.find_by_email(EMAIL).password_cost == app.config["BCRYPT_LOG_ROUNDS"]
+    assert login_user(client).status_code == HTTPStatus.OK
+
+
+def test_login_throttled_after_repeated_failures(app, client, db):
+    register_user(client)
+    limit = app.config["LOGIN_MAX_FAILURES_PER_EMAIL"]
+    for _ in range(limit):
+        response = login_user(client, password="wrong-password")
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+    response = login_user(client)
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.json["status"] == "fail"
+    assert int(response.headers["Retry-After"]) > 0
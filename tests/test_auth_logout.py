@@ -0,0 +1,61 @@
+"""Unit tests for api.auth_logout API endpoint."""
+import time
+from http import HTTPStatus
+from uuid import uuid4
+
+from src.robot_management.models.token_blacklist import BlacklistedToken
+from src.robot_management.models.user import User
+from src.robot_management.util.revocation import RevocationFilter
+from tests.util import get_access_token, get_user, logout_user
+
+SUCCESS = "successfully logged out"
+TOKEN_BLACKLISTED = "Token blacklisted. Please log in again."
+
+
+def test_logout(client, db):
+    access_token = get_access_token(client)
+    assert get_user(client, access_token).status_code == HTTPStatus.OK
+    response = logout_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["message"] == SUCCESS
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json["message"] == TOKEN_BLACKLISTED
+
+
+def test_logout_seen_by_other_process(app, client, db):
+    app.config["BLACKLIST_SYNC_SECONDS"] = 0
+    access_token = get_access_token(client)
+    assert User.decode_access_token(access_token).success
+    token_payload = User.decode_access_token(access_token).value
+    jti, expires_at = token_payload["jti"], token_payload["expires_at"]
+    db.session.add(BlacklistedToken(jti, expires_at))
+    db.session.commit()
+    result = User.decode_access_token(access_token)
+    assert result.failure and result.error == TOKEN_BLACKLISTED
+
+
+def test_revocation_filter_shared_between_processes(tmp_path):
+    now = time.time()
+    worker_a = RevocationFilter(1000, 0.001, 3600, directory=str(tmp_path))
+    worker_b = RevocationFilter(1000, 0.001, 3600, directory=str(tmp_path))
+    jtis = [uuid4().hex for _ in range(200)]
+    for jti in jtis:
+        worker_a.add(jti, now)
+    assert all(worker_b.might_contain(jti, now) for jti in jtis)
+    assert not worker_b.might_contain(jtis[0], now + 7200)
+    worker_b.prune(now + 7200)
+    remaining = [path.name for path in tmp_path.iterdir()]
+    assert remaining == [f"revoked-{int((now + 7200) // 3600)}.bloom"]
+    worker_a.close()
+    worker_b.close()
+
+
+def test_purge_expired_tokens(db):
+    now = time.time()
+    expired = [BlacklistedToken(uuid4().hex, now - 60) for _ in range(5)]
+    active = BlacklistedToken(uuid4().hex, now + 3600)
+    db.session.add_all([*expired, active])
+    db.session.commit()
+    assert BlacklistedToken.purge_expired(batch_size=2) == (5, 0)
+    assert [token.jti for token in BlacklistedToken.query.all()] == [active.jti]
@@ -0,0 +1,96 @@
+"""Unit tests for api.change_list API endpoint."""
+from datetime import timedelta
+from http import HTTPStatus
+
+from flask import url_for
+
+from src.robot_management.models.change_log import ChangeLog
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.util.datetime_util import utc_now
+from tests.util import ADMIN_EMAIL, create_robot, login_user
+
+
+def _changes(client, access_token, **args):
+    return client.get(
+        url_for("api.change_list", **args),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def test_changes_since_returns_deltas_and_tombstones(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    create_robot(client, access_token, "r2d2", "astromech")
+    cursor = _changes(client, access_token).json["next"]
+    assert cursor == 1
+
+    create_robot(client, access_token, "c3po", "droid")
+    client.put(
+        url_for("api.robot", name="c3po"),
+        headers=headers,
+        data="name=c3po&type=protocol",
+        content_type="application/x-www-form-urlencoded",
+    )
+    client.delete(url_for("api.robot", name="r2d2"), headers=headers)
+    response = _changes(client, access_token, since=cursor)
+    assert response.status_code == HTTPStatus.OK
+    changes = response.json["changes"]
+    assert [(c["entity"], c["deleted"]) for c in changes] == [
+        ("robot", False),
+        ("robot", True),
+    ]
+    assert changes[0]["data"]["type"] == "protocol"
+    assert changes[1]["data"] is None
+    assert response.json["next"] == 4 and not response.json["more"]
+
+    response = _changes(client, access_token, since=4)
+    assert response.json == dict(changes=[], next=4, more=False)
+
+
+def test_changes_paging(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    for name in ("r2d2", "c3po", "bb8"):
+        create_robot(client, access_token, name, "droid")
+    response = _changes(client, access_token, since=0, limit=2)
+    assert [c["data"]["name"] for c in response.json["changes"]] == ["r2d2", "c3po"]
+    assert response.json["more"]
+    response = _changes(client, access_token, since=response.json["next"])
+    assert [c["data"]["name"] for c in response.json["changes"]] == ["bb8"]
+
+
+def test_changes_before_purged_floor_are_gone(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_robot(client, access_token, "r2d2", "astromech")
+    assert ChangeLog.purge(days=-1) == 1
+    assert TableVersion.get(ChangeLog.FLOOR)[0] == 1
+    response = _changes(client, access_token, since=0)
+    assert response.status_code == HTTPStatus.GONE
+    assert _changes(client, access_token, since=1).status_code == HTTPStatus.OK
+
+
+def test_changes_wait_for_settle_window(app, client, db, admin):
+    app.config["CHANGES_SETTLE_SECONDS"] = 60
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_robot(client, access_token, "r2d2", "astromech")
+    assert _changes(client, access_token, since=0).json["changes"] == []
+    assert _changes(client, access_token).json["next"] == 0
+
+
+def test_changes_hold_back_seqs_above_an_unsettled_one(db):
+    table = ChangeLog.__table__
+    now = utc_now().replace(tzinfo=None)
+    db.session.execute(
+        table.insert(),
+        [
+            dict(seq=1, entity="robot", entity_id=1, changed_at=now),
+            dict(seq=3, entity="robot", entity_id=3, changed_at=now - timedelta(hours=1)),
+        ],
+    )
+    db.session.commit()
+    # seq 1 is still settling, so seq 3 is held back even though it settled.
+    assert ChangeLog.since(0, 10, settle_seconds=60) == []
+    assert ChangeLog.latest(settle_seconds=60) == 0
+    # seq 2 was allocated before seq 3 but commits after it, within the window.
+    db.session.execute(table.insert(), dict(seq=2, entity="robot", entity_id=2))
+    db.session.commit()
+    assert [c.seq for c in ChangeLog.since(0, 10)] == [1, 2, 3]
@@ -0,0 +1,55 @@
+"""Unit tests for response compression."""
+import gzip
+from http import HTTPStatus
+
+from flask import url_for
+
+from src.robot_management import compress
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.table_version import TableVersion
+from tests.util import get_access_token
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def _add_robots(db, count):
+    db.session.add_all(Robot(name=f"robot-{i}", type="amr") for i in range(count))
+    TableVersion.bump(Robot.__tablename__)
+    db.session.commit()
+
+
+def test_robot_list_gzip_cached_by_etag(client, db):
+    _add_robots(db, 50)
+    plain = client.get(url_for("api.robot_list"))
+    response = client.get(url_for("api.robot_list"), headers=GZIP)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data) == plain.data
+    etag = response.headers["ETag"]
+    assert etag == f'{plain.headers["ETag"][:-1]}-gzip"'
+    again = client.get(url_for("api.robot_list"), headers=GZIP)
+    assert again.data == response.data
+    assert len(compress.cache) == 1
+    headers = dict(GZIP, **{"If-None-Match": etag})
+    response = client.get(url_for("api.robot_list"), headers=headers)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+
+def test_small_response_not_compressed(client, db):
+    _add_robots(db, 1)
+    response = client.get(url_for("api.robot_list"), headers=GZIP)
+    assert response.status_code == HTTPStatus.OK
+    assert "Content-Encoding" not in response.headers
+
+
+def test_streamed_export_gzip(client, db):
+    access_token = get_access_token(client)
+    url = url_for("api.task_execution_list", format="csv")
+    headers = {"Authorization": f"Bearer {access_token}"}
+    plain = client.get(url, headers=headers)
+    response = client.get(url, headers=dict(headers, **GZIP))
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == plain.data
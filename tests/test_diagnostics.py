@@ -0,0 +1,49 @@
+"""Unit tests for api.diagnostics_pool API endpoint."""
+from http import HTTPStatus
+
+import pytest
+from flask import url_for
+from sqlalchemy import create_engine, exc
+
+from src.robot_management.util.db_pool import InstrumentedQueuePool, pool_stats
+from tests.util import ADMIN_EMAIL, get_access_token, login_user
+
+
+def _get_pool_stats(client, access_token):
+    return client.get(
+        url_for("api.diagnostics_pool"),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def test_pool_stats(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    response = _get_pool_stats(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["database"]["pool_class"]
+    assert response.json["password_hashing"]["completed"] >= 1
+
+
+def test_pool_stats_admin_only(client, db):
+    response = _get_pool_stats(client, get_access_token(client))
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_instrumented_pool_records_waits(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.sqlite'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    connection = engine.connect()
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 1 and stats["checkouts"] == 1
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    connection.close()
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["timeouts"] == 1 and stats["max_wait_seconds"] >= 0.05
+    engine.dispose()
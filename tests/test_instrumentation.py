@@ -0,0 +1,38 @@
+"""Unit tests for per-request Server-Timing instrumentation."""
+import json
+
+from flask import url_for
+
+from tests.util import get_access_token, retrieve_task_execution_list
+
+
+def _metrics(response):
+    metrics = {}
+    for metric in response.headers["Server-Timing"].split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+def test_server_timing_reports_sql_auth_and_serialization(client, db, caplog):
+    access_token = get_access_token(client)
+    caplog.set_level("INFO")
+    response = retrieve_task_execution_list(client, access_token)
+    metrics = _metrics(response)
+    assert {"app", "db", "auth", "serialize"} <= set(metrics)
+    assert float(metrics["app"]["dur"]) >= float(metrics["db"]["dur"])
+    query_count = int(metrics["db"]["desc"].strip('"').split()[0])
+    assert query_count > 0
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["endpoint"] == "api.task_execution_list"
+    assert record["status"] == 200
+    assert record["sql_count"] == query_count
+    assert "auth_ms" in record and "serialize_ms" in record
+
+
+def test_server_timing_on_anonymous_request(client, db):
+    response = client.get(url_for("api.robot_list"))
+    metrics = _metrics(response)
+    assert "auth" not in metrics
+    assert metrics["db"]["desc"].endswith(' queries"')
@@ -0,0 +1,63 @@
+"""Unit tests for routing read-only requests to replica databases."""
+from http import HTTPStatus
+
+import pytest
+from flask import url_for
+from sqlalchemy import create_engine
+
+from src.robot_management.models.robot import Robot, robot_index
+from src.robot_management.util.db_routing import PRIMARY_COOKIE, ReplicaSet
+from tests.util import (
+    ADMIN_EMAIL,
+    create_robot,
+    get_access_token,
+    login_user,
+    retrieve_task_execution_list,
+)
+
+
+@pytest.fixture
+def replica(app, db, tmp_path):
+    url = f"sqlite:///{tmp_path / 'replica.sqlite'}"
+    engine = create_engine(url)
+    db.metadata.create_all(bind=engine)
+    engine.execute("INSERT INTO robot (name, type) VALUES ('replica-bot', 'amr')")
+    engine.dispose()
+    app.config["REPLICA_DATABASE_URLS"] = [url]
+    return url
+
+
+def _robot_names(client, **kwargs):
+    response = client.get(url_for("api.robot_list"), **kwargs)
+    assert response.status_code == HTTPStatus.OK
+    return [robot["name"] for robot in response.json]
+
+
+def test_reads_go_to_replica(client, db, replica):
+    assert _robot_names(client) == ["replica-bot"]
+
+
+def test_read_your_writes_pinned_to_primary(client, db, admin, replica):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    response = create_robot(client, access_token, "r2d2", "astromech")
+    assert response.status_code == HTTPStatus.CREATED
+    assert PRIMARY_COOKIE in response.headers["Set-Cookie"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert _robot_names(client, headers=headers) == ["r2d2"]
+
+
+def test_lagging_replica_falls_back_to_primary(client, db, replica, monkeypatch):
+    monkeypatch.setattr(ReplicaSet, "_measure_lag", lambda self, engine: 60.0)
+    assert _robot_names(client) == []
+
+
+def test_dimension_index_reads_new_robot_from_primary(client, db, replica):
+    access_token = get_access_token(client)
+    client.cookie_jar.clear()  # do not pin to the primary after registering
+    db.session.add(Robot(name="r2d2", type="astromech"))
+    db.session.commit()
+    robot_index.invalidate()
+    response = retrieve_task_execution_list(client, access_token, robot_name="r2d2")
+    assert response.status_code == HTTPStatus.OK
+    assert robot_index.has_name("r2d2")
+    assert not robot_index.has_name("replica-bot")
@@ -0,0 +1,94 @@
+"""Unit tests for the read-through response cache."""
+from http import HTTPStatus
+
+from flask import url_for
+
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.util.response_cache import ResponseCache
+from tests.util import (
+    END,
+    assert_max_queries,
+    create_task_execution,
+    get_access_token,
+    retrieve_task_execution_list,
+)
+
+
+def _create(client, access_token, robot_id, task_id):
+    response = create_task_execution(
+        client,
+        access_token,
+        robot_id=robot_id,
+        task_id=task_id,
+        end=END,
+        status="Success",
+    )
+    assert response.status_code == HTTPStatus.CREATED
+
+
+def test_task_execution_list_cached_until_write(client, db, dimensions):
+    robot_id, task_id = dimensions
+    access_token = get_access_token(client)
+    _create(client, access_token, robot_id, task_id)
+    first = retrieve_task_execution_list(client, access_token, robot_name="r2d2")
+    assert first.headers["X-Cache"] == "MISS"
+    with assert_max_queries(db, 1):
+        second = retrieve_task_execution_list(client, access_token, robot_name="r2d2")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.data == first.data
+
+    _create(client, access_token, robot_id, task_id)
+    third = retrieve_task_execution_list(client, access_token, robot_name="r2d2")
+    assert third.headers["X-Cache"] == "MISS"
+    assert len(third.json["task_executions"]) == 2
+
+
+def test_task_execution_list_cached_not_modified(client, db, dimensions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_list(client, access_token)
+    etag = response.headers["ETag"]
+    response = client.get(
+        url_for("api.task_execution_list"),
+        headers={"Authorization": f"Bearer {access_token}", "If-None-Match": etag},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_accept_header_selects_export_despite_cached_json(client, db, dimensions):
+    robot_id, task_id = dimensions
+    access_token = get_access_token(client)
+    _create(client, access_token, robot_id, task_id)
+    retrieve_task_execution_list(client, access_token)
+    assert retrieve_task_execution_list(client, access_token).headers["X-Cache"] == "HIT"
+    response = client.get(
+        url_for("api.task_execution_list"),
+        headers={"Authorization": f"Bearer {access_token}", "Accept": "text/csv"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "text/csv"
+    assert "X-Cache" not in response.headers
+
+
+def test_shared_backend_between_processes(app, tmp_path):
+    app.config["RESPONSE_CACHE_PATH"] = str(tmp_path / "responses.sqlite")
+    worker_a, worker_b = ResponseCache(app), ResponseCache(app)
+    worker_a.set("key", (b"[]", "application/json"), ttl=30)
+    assert worker_b.get("key") == (b"[]", "application/json")
+    assert worker_b.get("other") is None
+
+
+def test_relative_shared_path_uses_instance_folder(app, tmp_path):
+    app.instance_path = str(tmp_path)
+    app.config["RESPONSE_CACHE_PATH"] = "responses.sqlite"
+    assert ResponseCache(app).shared.path == str(tmp_path / "responses.sqlite")
+
+
+def test_sharded_table_version_sums_every_shard(db):
+    for _ in range(20):
+        TableVersion.bump("task_execution", shards=4)
+    db.session.commit()
+    assert TableVersion.get("task_execution")[0] == 20
+    assert TableVersion.get_many(["task_execution", "robot"]) == dict(
+        task_execution=20, robot=0
+    )
+    assert TableVersion.query.filter_by(name="task_execution").count() > 1
@@ -0,0 +1,59 @@
+"""Unit tests for conditional GET requests to api.robot_list and api.task_list."""
+from http import HTTPStatus
+
+from flask import url_for
+
+from src.robot_management.models.task import Task
+from tests.util import (
+    ADMIN_EMAIL,
+    assert_max_queries,
+    create_robot,
+    get_access_token,
+    login_user,
+)
+
+
+def test_robot_list_not_modified(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_robot(client, access_token, "r2d2", "astromech")
+    response = client.get(url_for("api.robot_list"))
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    with assert_max_queries(db, 1):
+        response = client.get(url_for("api.robot_list"), headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert not response.data
+
+    create_robot(client, access_token, "c3po", "droid")
+    response = client.get(url_for("api.robot_list"), headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+    assert [robot["name"] for robot in response.json] == ["r2d2", "c3po"]
+
+
+def test_robot_list_if_modified_since(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_robot(client, access_token, "r2d2", "astromech")
+    last_modified = client.get(url_for("api.robot_list")).headers["Last-Modified"]
+    headers = {"If-Modified-Since": last_modified}
+    response = client.get(url_for("api.robot_list"), headers=headers)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_task_list_not_modified(client, db):
+    db.session.add(Task(name="repair", type="fix"))
+    db.session.commit()
+    access_token = get_access_token(client)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = client.get(url_for("api.task_list"), headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert "private" in response.headers["Cache-Control"]
+    headers["If-None-Match"] = response.headers["ETag"]
+    response = client.get(url_for("api.task_list"), headers=headers)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    response = client.get(
+        url_for("api.task_list"), headers={"If-None-Match": headers["If-None-Match"]}
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,56 @@
+"""Unit tests for the JSON response encoders."""
+import json
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+from flask import url_for
+from flask_restx import marshal
+
+from src.robot_management.api.encoders import task_execution_encoder
+from src.robot_management.api.parsers import task_execution_model
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.util import serialization
+from tests.util import get_access_token
+
+START = datetime(2021, 3, 1, 12, 0, 0, 250000)
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request):
+    yield serialization.use_backend(request.param)
+    serialization.use_backend("orjson")
+
+
+def test_dumps_backends_agree(backend):
+    payload = dict(start=START, end=None, ok=True, items=[1, "é"])
+    assert json.loads(serialization.dumps(payload)) == dict(
+        start=START.isoformat(), end=None, ok=True, items=[1, "é"]
+    )
+
+
+def test_task_execution_encoder_matches_restx_model(db, backend):
+    robot, task = Robot(name="r2d2", type="astromech"), Task(name="repair", type="fix")
+    execution = TaskExecution(
+        robot=robot, task=task, start=START, end=START.replace(hour=13), success=True
+    )
+    db.session.add(execution)
+    db.session.commit()
+    encoded = json.loads(serialization.dumps(task_execution_encoder(execution)))
+    assert encoded == json.loads(json.dumps(marshal(execution, task_execution_model)))
+    assert list(encoded) == list(task_execution_model)
+
+
+def test_retrieve_task_list(client, db, backend):
+    db.session.add_all([Task(name="repair", type="fix"), Task(name="talk", type="social")])
+    db.session.commit()
+    access_token = get_access_token(client)
+    response = client.get(
+        url_for("api.task_list"), headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.content_type == "application/json"
+    assert [task["name"] for task in response.json] == ["repair", "talk"]
+    assert set(response.json[0]) == {"id", "name", "type"}
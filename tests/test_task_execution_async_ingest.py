@@ -0,0 +1,98 @@
+"""Unit tests for the async (write-behind) task execution ingest mode."""
+import json
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+
+from src.robot_management.api.task_executions.ingest import (
+    flush_ingest_queue,
+    get_ingest_queue,
+)
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.models.task_execution_rollup import TaskExecutionRollup
+from src.robot_management.util.durable_queue import DurableQueue
+from tests.util import (
+    END,
+    create_task_execution,
+    create_task_execution_bulk,
+    get_access_token,
+)
+
+
+@pytest.fixture
+def async_ingest(app, dimensions, tmp_path):
+    app.config["TASK_EXECUTION_ASYNC_INGEST"] = True
+    app.config["INGEST_QUEUE_PATH"] = str(tmp_path / "ingest.sqlite")
+    return dimensions
+
+
+def test_create_task_execution_accepted_then_flushed(client, db, async_ingest):
+    robot_id, task_id = async_ingest
+    access_token = get_access_token(client)
+    response = create_task_execution(
+        client, access_token, robot_id=robot_id, task_id=task_id, end=END, status="Success"
+    )
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert response.json["id"]
+    assert TaskExecution.query.count() == 0
+    assert get_ingest_queue().stats()["pending"] == 1
+    assert flush_ingest_queue() == 1
+    assert TaskExecution.query.one().success
+    assert TaskExecutionRollup.query.one().count == 1
+    assert get_ingest_queue().stats()["pending"] == 0
+
+
+def test_bulk_accepted_then_flushed(client, db, async_ingest):
+    access_token = get_access_token(client)
+    items = [
+        dict(robot_name="r2d2", task_name="repair", end=END, status="Failure")
+        for _ in range(3)
+    ] + [dict(robot_name="bb8", task_name="repair", end=END, status="Success")]
+    response = create_task_execution_bulk(
+        client, access_token, json.dumps(items), "application/json"
+    )
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert len(response.json["ids"]) == 3
+    assert [error["index"] for error in response.json["errors"]] == [3]
+    assert flush_ingest_queue() == 3
+    assert TaskExecution.query.count() == 3
+
+
+def test_durable_queue_redelivers_unacked(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    queue = DurableQueue(path, lease_seconds=0)
+    queue.put([dict(n=1), dict(n=2)])
+    first = queue.claim(10)
+    assert [payload for _, payload, _ in first] == [dict(n=1), dict(n=2)]
+    other_worker = DurableQueue(path, lease_seconds=60)
+    again = other_worker.claim(10)
+    assert [attempts for _, _, attempts in again] == [2, 2]
+    assert other_worker.claim(10) == []
+    other_worker.ack([id for id, _, _ in again])
+    assert queue.stats()["pending"] == 0
+
+
+def test_failed_rows_released_for_next_flush(app, db, async_ingest):
+    robot_id, task_id = async_ingest
+    app.config["INGEST_MAX_ATTEMPTS"] = 2
+    start = date.today().isoformat()
+    good = dict(robot_id=robot_id, task_id=task_id, start=start, end=END, success=True)
+    bad = dict(good, robot_id=None)
+    queue = get_ingest_queue()
+    queue.put([good, bad])
+    assert flush_ingest_queue() == 1
+    stats = queue.stats()
+    assert (stats["pending"], stats["buried"]) == (1, 0)
+    assert flush_ingest_queue() == 0
+    stats = queue.stats()
+    assert (stats["pending"], stats["buried"]) == (0, 1)
+    assert TaskExecution.query.count() == 1
+
+
+def test_relative_ingest_queue_path_uses_instance_folder(app, tmp_path):
+    app.instance_path = str(tmp_path)
+    app.config["INGEST_QUEUE_PATH"] = "ingest.sqlite"
+    with app.app_context():
+        queue = get_ingest_queue()
+    assert queue.path == str(tmp_path / "ingest.sqlite")
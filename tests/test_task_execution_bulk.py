@@ -0,0 +1,100 @@
+"""Unit tests for api.task_execution_bulk API endpoint."""
+import json
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.robot_management.api.task_executions import business
+from src.robot_management.models.task_execution import TaskExecution
+from tests.util import create_task_execution_bulk, get_access_token
+
+
+def _item(i, **overrides):
+    item = dict(
+        robot_name="r2d2",
+        task_name="repair",
+        start=f"2021-03-01T12:{i % 60:02d}:00Z",
+        end=f"2021-03-01T13:{i % 60:02d}:00Z",
+        status="Success" if i % 2 else "Failure",
+    )
+    item.update(overrides)
+    return item
+
+
+def test_bulk_json_array(client, db, dimensions):
+    access_token = get_access_token(client)
+    items = [_item(i) for i in range(250)]
+    response = create_task_execution_bulk(
+        client, access_token, json.dumps(items), "application/json"
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(response.json["ids"]) == 250 and response.json["errors"] == []
+    assert TaskExecution.query.count() == 250
+    assert TaskExecution.query.filter_by(success=True).count() == 125
+
+
+def test_bulk_ndjson_with_item_errors(client, db, dimensions):
+    robot_id, task_id = dimensions
+    access_token = get_access_token(client)
+    items = [
+        _item(0, robot_name=None, robot_id=robot_id, task_name=None, task_id=task_id),
+        _item(1, robot_name="hal"),
+        _item(2, end="not a date"),
+        _item(3, status="Maybe"),
+    ]
+    body = "\n".join(json.dumps(item) for item in items)
+    response = create_task_execution_bulk(
+        client, access_token, body, "application/x-ndjson"
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(response.json["ids"]) == 1
+    errors = {e["index"]: e["errors"] for e in response.json["errors"]}
+    assert list(errors) == [1, 2, 3]
+    assert "robot" in errors[1] and "end" in errors[2] and "status" in errors[3]
+
+
+def test_bulk_all_invalid(client, db, dimensions):
+    access_token = get_access_token(client)
+    response = create_task_execution_bulk(
+        client, access_token, json.dumps([_item(0, task_name="nap")]), "application/json"
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert TaskExecution.query.count() == 0
+
+
+def test_bulk_out_of_range_date_is_item_error(client, db, dimensions):
+    access_token = get_access_token(client)
+    items = [_item(0), _item(1, start="99999999999999999999")]
+    response = create_task_execution_bulk(
+        client, access_token, json.dumps(items), "application/json"
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(response.json["ids"]) == 1
+    assert [e["index"] for e in response.json["errors"]] == [1]
+    assert "start" in response.json["errors"][0]["errors"]
+
+
+def _fail_insert(monkeypatch, message):
+    def insert_task_executions(rows, chunk_size):
+        raise IntegrityError("INSERT INTO task_execution", {}, Exception(message))
+
+    monkeypatch.setattr(business, "insert_task_executions", insert_task_executions)
+
+
+def test_bulk_foreign_key_violation_is_bad_request(client, db, dimensions, monkeypatch):
+    access_token = get_access_token(client)
+    _fail_insert(monkeypatch, "FOREIGN KEY constraint failed")
+    response = create_task_execution_bulk(
+        client, access_token, json.dumps([_item(0)]), "application/json"
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_bulk_other_integrity_errors_propagate(client, db, dimensions, monkeypatch):
+    access_token = get_access_token(client)
+    _fail_insert(monkeypatch, "NOT NULL constraint failed: task_execution.start")
+    with pytest.raises(IntegrityError):
+        create_task_execution_bulk(
+            client, access_token, json.dumps([_item(0)]), "application/json"
+        )
@@ -0,0 +1,77 @@
+"""Unit tests for POST requests to api.task_execution_list API endpoint."""
+from http import HTTPStatus
+
+from src.robot_management.models.robot import Robot, robot_index
+from src.robot_management.models.task import task_index
+from src.robot_management.models.task_execution import TaskExecution
+from tests.util import (
+    ADMIN_EMAIL,
+    END,
+    assert_max_queries,
+    create_robot,
+    create_task_execution,
+    get_access_token,
+    login_user,
+)
+
+
+def test_create_task_execution_no_dimension_queries(client, db, dimensions):
+    robot_id, task_id = dimensions
+    access_token = get_access_token(client)
+    assert robot_index.has_id(robot_id)
+    assert task_index.has_id(task_id)
+    with assert_max_queries(db, 13) as statements:
+        response = create_task_execution(
+            client,
+            access_token,
+            robot_id=robot_id,
+            task_id=task_id,
+            end=END,
+            status="Success",
+        )
+    assert response.status_code == HTTPStatus.CREATED
+    insert = next(i for i, s in enumerate(statements) if s.startswith("INSERT"))
+    assert not any("FROM robot" in s or "FROM task" in s for s in statements[:insert])
+    assert TaskExecution.query.count() == 1
+
+
+def test_create_task_execution_unknown_robot(client, db, dimensions):
+    _, task_id = dimensions
+    access_token = get_access_token(client)
+    response = create_task_execution(
+        client, access_token, robot_id=999, task_id=task_id, end=END, status="Success"
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "robot_id" in response.json["errors"]
+
+
+def test_create_task_execution_reloads_index_on_miss(app, client, db, dimensions):
+    _, task_id = dimensions
+    access_token = get_access_token(client)
+    assert robot_index.has_name("r2d2")
+    robot = Robot(name="bb8", type="astromech")
+    db.session.add(robot)
+    db.session.commit()  # as another worker would: the index is not invalidated
+    app.config["DIMENSION_MISS_RELOAD_SECONDS"] = 0
+    response = create_task_execution(
+        client, access_token, robot_id=robot.id, task_id=task_id, end=END, status="Success"
+    )
+    assert response.status_code == HTTPStatus.CREATED
+
+
+def test_create_robot_invalidates_index(client, db, admin, dimensions):
+    _, task_id = dimensions
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    assert not robot_index.has_name("bb8")
+    response = create_robot(client, access_token, "bb8", "astromech")
+    assert response.status_code == HTTPStatus.CREATED
+    assert robot_index.has_name("bb8")
+    response = create_task_execution(
+        client,
+        access_token,
+        robot_id=robot_index.id_for_name("bb8"),
+        task_id=task_id,
+        end=END,
+        status="Success",
+    )
+    assert response.status_code == HTTPStatus.CREATED
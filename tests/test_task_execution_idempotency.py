@@ -0,0 +1,103 @@
+"""Unit tests for Idempotency-Key handling on task execution POST endpoints."""
+from http import HTTPStatus
+
+from flask import url_for
+
+from src.robot_management.api.idempotency import get_idempotency_store
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.util.expiring_store import ExpiringStore
+from tests.util import END, assert_max_queries, get_access_token
+
+
+def _post(client, access_token, endpoint, key=None, **kwargs):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    if key:
+        headers["Idempotency-Key"] = key
+    return client.post(url_for(endpoint), headers=headers, **kwargs)
+
+
+def _form(robot_id, task_id, status="Success"):
+    return dict(
+        data=dict(robot_id=robot_id, task_id=task_id, end=END, status=status),
+        content_type="application/x-www-form-urlencoded",
+    )
+
+
+def test_create_replay_returns_stored_response(client, db, dimensions):
+    access_token = get_access_token(client)
+    endpoint = "api.task_execution_list"
+    response = _post(client, access_token, endpoint, "abc", **_form(*dimensions))
+    assert response.status_code == HTTPStatus.CREATED
+    with assert_max_queries(db, 1):
+        replay = _post(client, access_token, endpoint, "abc", **_form(*dimensions))
+    assert replay.status_code == HTTPStatus.CREATED
+    assert replay.headers["Location"] == response.headers["Location"]
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json == response.json
+    assert TaskExecution.query.count() == 1
+
+
+def test_create_key_reused_with_different_body(client, db, dimensions):
+    access_token = get_access_token(client)
+    endpoint = "api.task_execution_list"
+    _post(client, access_token, endpoint, "abc", **_form(*dimensions))
+    response = _post(
+        client, access_token, endpoint, "abc", **_form(*dimensions, status="Failure")
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert TaskExecution.query.count() == 1
+
+
+def test_create_failed_request_releases_key(client, db, dimensions):
+    access_token = get_access_token(client)
+    endpoint = "api.task_execution_list"
+    response = _post(client, access_token, endpoint, "abc", **_form(999, 999))
+    assert response.status_code >= HTTPStatus.BAD_REQUEST
+    response = _post(client, access_token, endpoint, "abc", **_form(999, 999))
+    assert "Idempotent-Replayed" not in response.headers
+
+
+def test_bulk_skips_items_with_seen_keys(client, db, dimensions):
+    access_token = get_access_token(client)
+    items = [
+        dict(
+            idempotency_key=f"item-{i}",
+            robot_name="r2d2",
+            task_name="repair",
+            start=f"2021-03-01T12:0{i}:00Z",
+            end=f"2021-03-01T13:0{i}:00Z",
+            status="Success",
+        )
+        for i in range(4)
+    ]
+    endpoint = "api.task_execution_bulk"
+    response = _post(client, access_token, endpoint, json=items[:3])
+    assert len(response.json["ids"]) == 3
+    response = _post(client, access_token, endpoint, json=items[1:] + items[3:])
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(response.json["ids"]) == 1
+    assert response.json["duplicates"] == [0, 1, 3]
+    assert TaskExecution.query.count() == 4
+
+
+def test_shared_store_in_progress_marker_is_not_cached(tmp_path):
+    path = str(tmp_path / "keys.sqlite")
+    worker_a, worker_b = ExpiringStore(10, path=path), ExpiringStore(10, path=path)
+    assert worker_a.add(b"key", ("body", None), ttl=60, cache=False)
+    assert worker_b.get(b"key", cache=False) == ("body", None)
+    assert not worker_b.add(b"key", ("body", None), ttl=60, cache=False)
+    worker_a.set(b"key", ("body", "saved"), ttl=3600)
+    assert worker_b.get(b"key", cache=False) == ("body", "saved")
+
+
+def test_shared_store_marker_expires_after_lease(tmp_path):
+    path = str(tmp_path / "keys.sqlite")
+    worker_a, worker_b = ExpiringStore(10, path=path), ExpiringStore(10, path=path)
+    assert worker_a.add(b"key", ("body", None), ttl=-1, cache=False)
+    assert worker_b.add(b"key", ("body", None), ttl=60, cache=False)
+
+
+def test_relative_store_path_uses_instance_folder(app, tmp_path):
+    app.instance_path = str(tmp_path)
+    app.config["IDEMPOTENCY_STORE_PATH"] = "idempotency_keys.sqlite"
+    assert get_idempotency_store(app).path == str(tmp_path / "idempotency_keys.sqlite")
@@ -0,0 +1,155 @@
+"""Unit tests for GET requests to api.task_execution_list API endpoint."""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from flask import url_for
+
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+from tests.util import (
+    assert_max_queries,
+    get_access_token,
+    retrieve_task_execution,
+    retrieve_task_execution_list,
+)
+
+START = datetime(2021, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def executions(db):
+    robots = [Robot(name="r2d2", type="astromech"), Robot(name="c3po", type="droid")]
+    tasks = [Task(name="repair", type="maintenance"), Task(name="talk", type="social")]
+    db.session.add_all(robots + tasks)
+    db.session.flush()
+    for i in range(6):
+        db.session.add(
+            TaskExecution(
+                robot_id=robots[i % 2].id,
+                task_id=tasks[i % 3 == 0].id,
+                start=START + timedelta(hours=i),
+                end=START + timedelta(hours=i, minutes=30),
+                success=i % 2 == 0,
+            )
+        )
+    db.session.commit()
+    return TaskExecution.query.order_by(TaskExecution.id).all()
+
+
+def _ids(response):
+    return sorted(te["id"] for te in response.json["task_executions"])
+
+
+def test_retrieve_task_execution_list_no_filters(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_list(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert _ids(response) == [te.id for te in executions]
+
+
+def test_retrieve_task_execution_list_filter_robot_and_task(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_list(
+        client, access_token, robot_name="r2d2", task_type="maintenance"
+    )
+    assert response.status_code == HTTPStatus.OK
+    expected = [
+        te.id
+        for te in executions
+        if te.robot_name == "r2d2" and te.task_type == "maintenance"
+    ]
+    assert _ids(response) == expected
+
+
+def test_retrieve_task_execution_list_filter_time_range_and_status(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_list(
+        client,
+        access_token,
+        start=(START + timedelta(hours=1)).isoformat(),
+        end=(START + timedelta(hours=4, minutes=30)).isoformat(),
+        status="Success",
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert _ids(response) == [executions[2].id, executions[4].id]
+
+
+def test_retrieve_task_execution_list_unknown_robot(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_list(client, access_token, robot_name="hal")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_retrieve_task_execution_list_keyset_pagination(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_list(client, access_token, limit=4)
+    assert _ids(response) == [te.id for te in executions[:4]]
+    assert response.json["prev"] is None and response.json["next"]
+
+    response = retrieve_task_execution_list(
+        client, access_token, limit=4, cursor=response.json["next"]
+    )
+    assert _ids(response) == [te.id for te in executions[4:]]
+    assert response.json["next"] is None and response.json["prev"]
+
+    response = retrieve_task_execution_list(
+        client, access_token, limit=4, cursor=response.json["prev"]
+    )
+    assert _ids(response) == [te.id for te in executions[:4]]
+    assert response.json["prev"] is None
+
+
+def test_retrieve_task_execution_list_invalid_cursor(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_list(client, access_token, cursor="garbage")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_retrieve_task_execution_list_no_n_plus_one(client, db, executions):
+    access_token = get_access_token(client)
+    db.session.expire_all()
+    with assert_max_queries(db, 3):
+        response = retrieve_task_execution_list(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    first = response.json["task_executions"][0]
+    assert first["robot"] == dict(name="r2d2", type="astromech")
+    assert first["task"] == dict(name="talk", type="social")
+
+
+def test_retrieve_task_execution_no_lazy_loads(client, db, executions):
+    access_token = get_access_token(client)
+    id = executions[1].id
+    db.session.expire_all()
+    with assert_max_queries(db, 2):
+        response = retrieve_task_execution(client, access_token, id)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["robot"]["name"] == "c3po"
+
+
+def test_export_task_executions_ndjson(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_list(
+        client, access_token, format="ndjson", robot_name="c3po"
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["id"] for row in rows] == [te.id for te in executions[1::2]]
+    assert rows[0]["robot_type"] == "droid" and rows[0]["status"] == "Failed"
+
+
+def test_export_task_executions_csv_from_accept_header(client, executions):
+    access_token = get_access_token(client)
+    response = client.get(
+        url_for("api.task_execution_list"),
+        headers={"Authorization": f"Bearer {access_token}", "Accept": "text/csv"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == len(executions)
+    assert rows[0]["start"] == START.isoformat()
@@ -0,0 +1,168 @@
+"""Unit tests for api.task_execution_stats API endpoint."""
+import json
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from flask import url_for
+
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.table_version import TableVersion
+from src.robot_management.models.task import Task
+from src.robot_management.models.task_execution import TaskExecution
+from src.robot_management.models.task_execution_rollup import TaskExecutionRollup
+from tests.util import (
+    ADMIN_EMAIL,
+    create_task_execution_bulk,
+    get_access_token,
+    login_user,
+    retrieve_task_execution_stats,
+)
+
+START = datetime(2021, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def executions(db):
+    robots = [Robot(name="r2d2", type="astromech"), Robot(name="c3po", type="droid")]
+    task = Task(name="repair", type="maintenance")
+    db.session.add_all(robots + [task])
+    db.session.flush()
+    for i in range(8):
+        db.session.add(
+            TaskExecution(
+                robot_id=robots[i % 2].id,
+                task_id=task.id,
+                start=START + timedelta(minutes=30 * i),
+                end=START + timedelta(minutes=30 * i, seconds=60 * (i + 1)),
+                success=i < 6,
+            )
+        )
+    db.session.commit()
+
+
+def test_stats_totals(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_stats(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    (stats,) = response.json["stats"]
+    assert stats["count"] == 8 and stats["success_count"] == 6
+    assert stats["success_ratio"] == 0.75
+    assert stats["duration"]["min"] == 60 and stats["duration"]["max"] == 480
+
+
+def test_stats_group_by_robot_and_hour(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_stats(
+        client, access_token, group_by=["robot_name", "status"], bucket="hour"
+    )
+    assert response.status_code == HTTPStatus.OK
+    stats = response.json["stats"]
+    assert {"robot_name", "status", "bucket"} <= set(stats[0])
+    c3po_failed = [
+        s for s in stats if s["robot_name"] == "c3po" and s["status"] == "Failed"
+    ]
+    assert [(s["bucket"], s["count"]) for s in c3po_failed] == [
+        ("2021-03-01T15:00:00", 1)
+    ]
+    assert sum(s["count"] for s in stats) == 8
+
+
+def test_stats_invalid_group_by(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_stats(client, access_token, group_by="colour")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def _without_percentiles(stats):
+    for row in stats:
+        row["duration"] = row["duration"]["avg"]
+    return stats
+
+
+def test_stats_rollup_matches_raw(client, db, executions):
+    TaskExecutionRollup.rebuild()
+    db.session.commit()
+    access_token = get_access_token(client)
+    args = dict(group_by=["robot_name", "task_type"], bucket="day")
+    raw = retrieve_task_execution_stats(client, access_token, **args)
+    rollup = retrieve_task_execution_stats(
+        client, access_token, source="rollup", **args
+    )
+    assert rollup.status_code == HTTPStatus.OK
+    assert _without_percentiles(rollup.json["stats"]) == _without_percentiles(
+        raw.json["stats"]
+    )
+
+
+def test_stats_rollup_incremental(client, db, admin, executions):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    items = [
+        dict(
+            robot_name="r2d2",
+            task_name="repair",
+            start="2021-03-02T08:15:00",
+            end="2021-03-02T08:25:00",
+            status="Success",
+        )
+    ] * 3
+    response = create_task_execution_bulk(
+        client, access_token, json.dumps(items), "application/json"
+    )
+    ids = response.json["ids"]
+    client.delete(
+        url_for("api.task_execution", id=ids[0]),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    response = retrieve_task_execution_stats(
+        client, access_token, source="rollup", start="2021-03-02T00:00:00"
+    )
+    (stats,) = response.json["stats"]
+    assert stats["count"] == 2 and stats["success_count"] == 2
+    assert stats["duration"]["avg"] == 600
+
+
+def test_rollup_delete_only_prunes_touched_keys(db, executions):
+    TaskExecutionRollup.rebuild()
+    untouched = TaskExecutionRollup.query.filter_by(bucket_start=START).first()
+    untouched.count = 0
+    db.session.commit()
+    execution = TaskExecution.query.order_by(TaskExecution.id.desc()).first()
+    key = dict(
+        bucket_start=execution.start.replace(minute=0),
+        robot_id=execution.robot_id,
+        task_id=execution.task_id,
+    )
+    TaskExecutionRollup.apply([execution], sign=-1)
+    db.session.commit()
+    assert TaskExecutionRollup.query.filter_by(**key).first() is None
+    assert TaskExecutionRollup.query.get(
+        (untouched.bucket_start, untouched.robot_id, untouched.task_id)
+    )
+
+
+def test_delete_execution_without_start(client, db, admin, executions):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    execution = TaskExecution.query.first()
+    TaskExecution.query.filter_by(id=execution.id).update({"start": None})
+    db.session.commit()
+    response = client.delete(
+        url_for("api.task_execution", id=execution.id),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.NO_CONTENT
+
+
+def test_rollup_rebuild_bumps_task_execution_version(db, executions):
+    version, _ = TableVersion.get(TaskExecution.__tablename__)
+    TaskExecutionRollup.rebuild()
+    db.session.commit()
+    assert TableVersion.get(TaskExecution.__tablename__)[0] == version + 1
+
+
+def test_stats_rollup_unsupported_arguments(client, executions):
+    access_token = get_access_token(client)
+    response = retrieve_task_execution_stats(
+        client, access_token, source="rollup", group_by="status"
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,131 @@
+"""Unit tests for api.task_execution_stream API endpoint."""
+import json
+import time
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+from flask import url_for
+
+from src.robot_management.api.task_executions.stream import (
+    Watermark,
+    get_task_execution_broker,
+)
+from src.robot_management.models.robot import Robot
+from src.robot_management.models.task_execution import TaskExecution
+from tests.util import (
+    END,
+    create_task_execution,
+    create_task_execution_bulk,
+    get_access_token,
+)
+
+
+@pytest.fixture
+def other_robot_id(db, dimensions):
+    other = Robot(name="c3po", type="protocol")
+    db.session.add(other)
+    db.session.commit()
+    return other.id
+
+
+def _open_stream(client, access_token, last_event_id=None, **args):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    if last_event_id is not None:
+        headers["Last-Event-ID"] = str(last_event_id)
+    response = client.get(
+        url_for("api.task_execution_stream", **args), headers=headers, buffered=False
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "text/event-stream"
+    return response, iter(response.response)
+
+
+def _create(client, access_token, robot_id, task_id):
+    response = create_task_execution(
+        client,
+        access_token,
+        robot_id=robot_id,
+        task_id=task_id,
+        end=END,
+        status="Success",
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    return int(response.headers["Location"].rsplit("/", 1)[1])
+
+
+def test_stream_pushes_new_executions(client, db, dimensions, other_robot_id):
+    robot_id, task_id = dimensions
+    access_token = get_access_token(client)
+    response, events = _open_stream(client, access_token, robot_name="r2d2")
+    assert next(events).startswith(b"retry:")
+    _create(client, access_token, other_robot_id, task_id)
+    id = _create(client, access_token, robot_id, task_id)
+    event = next(events)
+    assert event.startswith(f"id: {id}\nevent: task_execution\n".encode())
+    assert b'"name":"r2d2"' in event
+    response.close()
+    assert get_task_execution_broker().stats()["subscribers"] == 0
+
+
+def test_stream_resumes_after_last_event_id(client, db, dimensions):
+    robot_id, task_id = dimensions
+    access_token = get_access_token(client)
+    first = _create(client, access_token, robot_id, task_id)
+    second = _create(client, access_token, robot_id, task_id)
+    response, events = _open_stream(client, access_token, last_event_id=first)
+    next(events)
+    assert next(events).startswith(f"id: {second}\n".encode())
+    response.close()
+
+
+def test_slow_subscriber_overflows_instead_of_growing(app):
+    broker = get_task_execution_broker(app)
+    broker.buffer_size = 2
+    with broker.subscribe() as subscription:
+        for id in range(3):
+            broker.publish(id)
+        assert subscription.overflowed
+        assert subscription.get(timeout=0) == []
+
+
+def test_stream_delivers_bulk_rows_committed_before_a_published_one(
+    app, client, db, dimensions
+):
+    robot_id, task_id = dimensions
+    app.config["TASK_EXECUTION_STREAM_HEARTBEAT"] = 0.01
+    access_token = get_access_token(client)
+    response, events = _open_stream(client, access_token)
+    assert next(events).startswith(b"retry:")
+    assert next(events) == b": keep-alive\n\n"  # now subscribed
+    first = _create(client, access_token, robot_id, task_id)
+    assert next(events).startswith(f"id: {first}\n".encode())
+    items = [
+        dict(robot_id=robot_id, task_id=task_id, end=END, status="Success")
+        for _ in range(3)
+    ]
+    bulk = create_task_execution_bulk(
+        client, access_token, json.dumps(items), "application/json"
+    )
+    last = _create(client, access_token, robot_id, task_id)
+    received = [next(events).split(b"\n", 1)[0] for _ in range(4)]
+    expected = bulk.json["ids"] + [last]
+    assert received == [f"id: {id}".encode() for id in expected]
+    response.close()
+
+
+def test_watermark_waits_for_ids_committed_out_of_order(db, dimensions):
+    robot_id, task_id = dimensions
+    watermark = Watermark(0.05)
+
+    def commit_execution(id):
+        db.session.add(
+            TaskExecution(id=id, robot_id=robot_id, task_id=task_id, end=datetime.utcnow())
+        )
+        db.session.commit()
+
+    commit_execution(5)
+    assert watermark.advance() == 0 and watermark.pending
+    commit_execution(3)  # allocated before 5, committed after it was seen
+    time.sleep(0.05)
+    assert watermark.advance() == 5 and not watermark.pending
@@ -1,10 +1,15 @@
 """Shared functions and constants for unit tests."""
+from contextlib import contextmanager
+from datetime import date, timedelta
 
 from flask import url_for
+from sqlalchemy import event
 
 
 EMAIL = "new_user@email.com"
+ADMIN_EMAIL = "admin_user@email.com"
 PASSWORD = "test1234"
+END = (date.today() + timedelta(days=1)).isoformat()
 
 
 def register_user(test_client, email=EMAIL, password=PASSWORD):
@@ -21,3 +26,89 @@ def login_user(test_client, email=EMAIL, password=PASSWORD):
         data=f"email={email}&password={password}",
         content_type="application/x-www-form-urlencoded",
     )
+
+
+def get_access_token(test_client, email=EMAIL, password=PASSWORD):
+    response = register_user(test_client, email=email, password=password)
+    return response.json["access_token"]
+
+
+def retrieve_task_execution_list(test_client, access_token, **filters):
+    return test_client.get(
+        url_for("api.task_execution_list"),
+        query_string=filters,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def retrieve_task_execution(test_client, access_token, id):
+    return test_client.get(
+        url_for("api.task_execution", id=id),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+@contextmanager
+def assert_max_queries(db, max_queries):
+    """Fail if more than max_queries SQL statements are executed in the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    assert len(statements) <= max_queries, (
+        f"{len(statements)} queries executed, expected at most {max_queries}:\n"
+        + "\n".join(statements)
+    )
+
+
+def create_robot(test_client, access_token, name, type):
+    return test_client.post(
+        url_for("api.robot_list"),
+        headers={"Authorization": f"Bearer {access_token}"},
+        data=f"name={name}&type={type}",
+        content_type="application/x-www-form-urlencoded",
+    )
+
+
+def create_task_execution(test_client, access_token, **form):
+    return test_client.post(
+        url_for("api.task_execution_list"),
+        headers={"Authorization": f"Bearer {access_token}"},
+        data=form,
+        content_type="application/x-www-form-urlencoded",
+    )
+
+
+def create_task_execution_bulk(test_client, access_token, body, content_type):
+    return test_client.post(
+        url_for("api.task_execution_bulk"),
+        headers={"Authorization": f"Bearer {access_token}"},
+        data=body,
+        content_type=content_type,
+    )
+
+
+def retrieve_task_execution_stats(test_client, access_token, **args):
+    return test_client.get(
+        url_for("api.task_execution_stats"),
+        query_string=args,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def get_user(test_client, access_token):
+    return test_client.get(
+        url_for("api.auth_user"), headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+
+def logout_user(test_client, access_token):
+    return test_client.post(
+        url_for("api.auth_logout"), headers={"Authorization": f"Bearer {access_token}"}
+    )